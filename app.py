@@ -1,27 +1,91 @@
+import io
 import os
 import re
+import socket
+import struct
 import time
 import uuid
+import random
 import json
+import hashlib
+import numpy as np
 import pandas as pd
 import threading
 import logging
+import queue
+import atexit
 import requests
 import csv
+from logging.handlers import QueueHandler, QueueListener
+from urllib.parse import quote
 from datetime import datetime, timedelta
-from flask import Flask, request, jsonify, render_template, send_file
+from flask import Flask, request, jsonify, render_template, send_file, Response
 from werkzeug.utils import secure_filename
 from requests.adapters import HTTPAdapter
 from urllib3.util import Retry
 from threading import Lock
-from concurrent.futures import ThreadPoolExecutor, as_completed
-
-# 配置简化的日志
-logging.basicConfig(
-    level=logging.WARNING,  # 调整为WARNING级别，减少INFO日志
-    format='[%(asctime)s] [%(levelname)s] %(message)s',  # 简化格式，移除文件名和行号
+from collections import Counter, deque, OrderedDict
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+
+# xlsxwriter是流式写入引擎（常量内存、写速约为openpyxl的2-3倍），未安装时退回默认引擎
+try:
+    import xlsxwriter  # noqa: F401
+    _EXCEL_WRITE_ENGINE = 'xlsxwriter'
+except ImportError:
+    _EXCEL_WRITE_ENGINE = None
+
+# calamine是Rust实现的读取引擎，大文件读取比openpyxl快数倍且内存恒定，未安装时退回openpyxl
+try:
+    import python_calamine  # noqa: F401
+    _EXCEL_READ_ENGINE = 'calamine'
+except ImportError:
+    _EXCEL_READ_ENGINE = 'openpyxl'
+
+# PIL仅用于资讯图片的尺寸检查，未安装时跳过检查、照常送审
+try:
+    from PIL import Image, UnidentifiedImageError
+    _PIL_AVAILABLE = True
+except ImportError:
+    _PIL_AVAILABLE = False
+
+# orjson解析UTF-8响应比标准库json快数倍，未安装时退回标准库
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_loads(data):
+    """JSON解析：优先orjson（直接吃bytes），退回标准库json"""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, bytes):
+        data = data.decode('utf-8')
+    return json.loads(data)
+
+# 模块加载时缓存不变量，避免每条日志都做gethostname/getpid系统调用
+_HOSTNAME = socket.gethostname()
+_PID = os.getpid()
+
+# 配置简化的日志：请求线程只把日志记录入队，格式化和写流
+# 由QueueListener在后台线程完成，避免热路径阻塞在handler锁和I/O上
+_log_formatter = logging.Formatter(
+    # 简化格式，移除文件名和行号；主机名和进程号直接拼进格式串，零每条开销
+    fmt='[%(asctime)s] [' + _HOSTNAME + ':' + str(_PID) + '] [%(levelname)s] %(message)s',
     datefmt='%H:%M:%S'  # 只显示时间，不显示日期
 )
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(_log_formatter)
+_log_queue = queue.Queue(-1)
+_log_listener = QueueListener(_log_queue, _log_stream_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+_root_logger = logging.getLogger()
+_root_logger.setLevel(logging.WARNING)  # 调整为WARNING级别，减少INFO日志
+_root_logger.addHandler(QueueHandler(_log_queue))
+
 logger = logging.getLogger(__name__)
 
 MAX_RETRIES = 3  # 最大重试次数
@@ -38,7 +102,8 @@ app = Flask(__name__)
 # 配置文件上传
 UPLOAD_FOLDER = 'data'
 RESULT_FOLDER = 'result'
-ALLOWED_EXTENSIONS = {'xlsx', 'xls'}
+# 预计算的扩展名集合（含点号，小写），O(1)查找且无每次调用的临时对象
+_ALLOWED_EXTS = frozenset({'.xlsx', '.xls'})
 
 # 确保目录存在
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
@@ -47,6 +112,133 @@ os.makedirs(RESULT_FOLDER, exist_ok=True)
 # API配置 - 更新为新的API地址
 API_URL = "https://jiuwen-api.vmic.xyz/v1/chat-messages"
 
+# 模块级共享HTTP会话：复用TCP/TLS连接与socket池，避免每次请求重新握手
+API_SESSION = requests.Session()
+_api_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=MAX_RETRIES, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504])
+)
+API_SESSION.mount('https://', _api_adapter)
+API_SESSION.mount('http://', _api_adapter)
+
+# 并发限流：用有界信号量约束同时在途的审核请求数，
+# 取代逐行sleep——sleep在并发下既不限流也浪费等待时间
+API_MAX_INFLIGHT = 16
+_api_semaphore = threading.BoundedSemaphore(API_MAX_INFLIGHT)
+
+@lru_cache(maxsize=16)
+def _auth_headers(api_key):
+    """按密钥缓存请求头——每次调用都新建dict+拼接字符串在并发下是无谓的分配"""
+    return {
+        "Content-Type": "application/json",
+        "Authorization": "Bearer %s" % api_key
+    }
+
+def _backoff(attempt, base=1.0, cap=30.0, jitter=0.5):
+    """带抖动的指数退避时长：并发重试错开时间，避免同时砸向刚恢复的服务"""
+    delay = min(cap, base * (2 ** attempt))
+    return delay * (1 + random.uniform(-jitter, jitter))
+
+# 常驻审核线程池：各审核流程复用同一组工作线程，
+# 避免每个文件/分块反复创建销毁线程池
+_AUDIT_EXECUTOR = ThreadPoolExecutor(max_workers=API_MAX_INFLIGHT, thread_name_prefix='audit')
+atexit.register(_AUDIT_EXECUTOR.shutdown, wait=False)
+
+# 资讯子任务线程池：单条资讯内部的图片/文本审核并发执行，
+# 与行级线程池分开，避免行任务占满工作线程后子任务饿死（嵌套提交死锁）
+_ITEM_EXECUTOR = ThreadPoolExecutor(max_workers=API_MAX_INFLIGHT, thread_name_prefix='news-item')
+atexit.register(_ITEM_EXECUTOR.shutdown, wait=False)
+
+# 按内容哈希缓存审核结果：上传表格里常有重复内容（转发、模板文案），
+# 命中缓存可直接省掉一次完整的API往返
+_AUDIT_CACHE_MAX = 10000
+_audit_cache = OrderedDict()
+_audit_cache_lock = Lock()
+
+
+def _now_str():
+    """秒级时间戳字符串，1秒内复用缓存，省去每行一次strftime和系统调用"""
+    mono = time.monotonic()
+    if mono - _now_str_cache[0] >= 1.0 or not _now_str_cache[1]:
+        _now_str_cache[0] = mono
+        _now_str_cache[1] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    return _now_str_cache[1]
+
+_now_str_cache = [0.0, '']
+
+def _audit_cache_key(kind, content):
+    """生成内容缓存键：审核类型 + 内容SHA1"""
+    return kind + ':' + hashlib.sha1(content.encode('utf-8', 'ignore')).hexdigest()
+
+def _audit_cache_get(key):
+    """查询内容缓存，命中时刷新LRU位置"""
+    with _audit_cache_lock:
+        if key in _audit_cache:
+            _audit_cache.move_to_end(key)
+            result, tags = _audit_cache[key]
+            return result, list(tags)
+    return None
+
+def _audit_cache_put(key, result, tags):
+    """写入内容缓存；失败类结果不缓存，保留重试机会"""
+    if result in ('处理失败', '解析失败', '请求超时', '服务异常'):
+        return
+    with _audit_cache_lock:
+        _audit_cache[key] = (result, list(tags))
+        _audit_cache.move_to_end(key)
+        while len(_audit_cache) > _AUDIT_CACHE_MAX:
+            _audit_cache.popitem(last=False)
+
+# 审核结果解析正则 - 模块加载时编译一次，逐行解析时直接复用
+_THINK_RE = re.compile(r'<think>.*?</think>', re.DOTALL)
+# 模式1：带编号的标准格式；模式2：不带编号；模式3：简化格式
+_RESULT_PATTERNS = [
+    re.compile(r'（1）\s*审核结果\s*[:：]\s*(\S+)', re.IGNORECASE),
+    re.compile(r'审核结果\s*[:：]\s*(\S+)', re.IGNORECASE),
+    re.compile(r'(?:审核结果|结果)\s*[:：]?\s*(正常|低质|违规)', re.IGNORECASE),
+]
+_TAG_PATTERNS = [
+    re.compile(r'（2）\s*低质标签\s*[:：]\s*(.+?)(?=\n|$)', re.IGNORECASE),
+    re.compile(r'低质标签\s*[:：]\s*(.+?)(?=\n|$)', re.IGNORECASE),
+    re.compile(r'(?:低质标签|标签|违规标签)\s*[:：]?\s*(.+?)(?=\n|$)', re.IGNORECASE),
+]
+# 双字段消毒用的控制字符/特殊字符正则
+# 标签分隔符归一化表：中英文逗号/顿号/分号统一为英文逗号
+_SEP_TABLE = str.maketrans({'，': ',', '、': ',', '；': ',', ';': ','})
+
+_SANITIZE_RE = re.compile(r'[\x00-\x1F\\"{}]')
+
+# 资讯信息解析用的预编译模式（parse_news_info每行都会调用）
+_NEWS_JSON_RE = re.compile(r'\{[^}]*["\']images["\'][^}]*["\']content["\'][^}]*\}', re.DOTALL)
+_IMAGES_FIELD_RE = re.compile(r'["\']images["\']\s*:\s*\[([^\]]+)\]')
+_QUOTED_ITEM_RE = re.compile(r'["\']([^"\',]+)["\']')
+_IMG_URL_RE = re.compile(
+    r'https?://[^\s<>"\)\]]+\.(?:jpe?g|png|gif|webp)\b[^\s<>"\)\]]*'
+    r'|https?://[^\s<>"\)\]]*image[^\s<>"\)\]]*', re.IGNORECASE)
+_CONTENT_FIELD_RE = re.compile(r'["\']content["\']\s*:\s*["\']([^"\']*)["\']', re.DOTALL)
+_JSON_ARRAY_RE = re.compile(r'\[.*\]', re.DOTALL)
+# 正文截止关键词：单次交替式扫描取最左命中，替代逐关键词str.find
+_STOP_KEYWORDS_RE = re.compile('|'.join(map(re.escape, ('精彩推荐', '相关推荐', '全部评论', '我要举报'))))
+
+# 合法审核类型/操作 - 模块级常量，各请求处理函数共用，免去每次请求重建列表
+_VALID_AUDIT_TYPES = frozenset({'comment', 'cover', 'push', 'brand', 'news'})
+_VALID_ACTIONS = frozenset({'pause', 'resume', 'finish', 'end'})
+
+# 每个会话一把锁，保护请求线程与工作线程对任务状态的并发更新
+_task_state_locks = {}
+_task_state_locks_guard = Lock()
+
+def _get_state_lock(audit_type, session_id):
+    """获取（必要时创建）某个会话任务状态对应的锁"""
+    key = (audit_type, session_id)
+    with _task_state_locks_guard:
+        lock = _task_state_locks.get(key)
+        if lock is None:
+            lock = Lock()
+            _task_state_locks[key] = lock
+        return lock
+
 # 任务状态 - 使用全局字典存储，不依赖Flask session
 task_status = {
     'comment': {},
@@ -55,69 +247,76 @@ task_status = {
     'brand': {},  # 品牌守护审核类型
     'news': {}   # 资讯巡检类型
 }
-# 历史记录
-history_records = []
-
 def allowed_file(filename):
     """检查文件类型是否允许"""
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return os.path.splitext(filename)[1].lower() in _ALLOWED_EXTS
+
+def _new_task_state(**extra):
+    """构造全新的任务状态字典 - 所有初始化入口共用，避免多份字面量各自漂移"""
+    state = {
+        'id': str(uuid.uuid4()),
+        'status': 'idle',
+        'progress': 0,
+        'total': 0,
+        'processed': 0,
+        'paused': False,
+        'message': '',
+        'statistics': {
+            'results': Counter(),
+            'tags': Counter()
+        },
+        'history': deque(maxlen=100)  # 有界，防止长任务下消息历史无限增长
+    }
+    state.update(extra)
+    return state
 
 def get_task_id(audit_type, session_id):
     """获取任务ID - 使用传入的session_id而非Flask session"""
     if session_id not in task_status[audit_type]:
-        task_status[audit_type][session_id] = {
-            'id': str(uuid.uuid4()),
-            'status': 'idle',
-            'progress': 0,
-            'total': 0,
-            'processed': 0,
-            'paused': False,
-            'message': '',
-            'statistics': {
-                'results': {},
-                'tags': {}
-            },
-            'history': []
-        }
+        task_status[audit_type][session_id] = _new_task_state()
     return task_status[audit_type][session_id]['id']
 
 def update_task_status(audit_type, session_id, status=None, progress=None, total=None, processed=None, paused=None, message=None):
-    """更新任务状态 - 使用传入的session_id而非Flask session"""
+    """更新任务状态 - 使用传入的session_id而非Flask session，按会话加锁"""
     if session_id in task_status[audit_type]:
-        if status is not None:
-            task_status[audit_type][session_id]['status'] = status
-        if progress is not None:
-            task_status[audit_type][session_id]['progress'] = progress
-        if total is not None:
-            task_status[audit_type][session_id]['total'] = total
-        if processed is not None:
-            task_status[audit_type][session_id]['processed'] = processed
-        if paused is not None:
-            task_status[audit_type][session_id]['paused'] = paused
-        if message is not None:
-            task_status[audit_type][session_id]['message'] = message
-            # 记录历史消息
-            task_status[audit_type][session_id]['history'].append({
-                'time': datetime.now().strftime('%H:%M:%S'),
-                'message': message,
-                'status': status or task_status[audit_type][session_id]['status']
-            })
+        with _get_state_lock(audit_type, session_id):
+            state = task_status[audit_type][session_id]
+            if status is not None:
+                state['status'] = status
+            if progress is not None:
+                state['progress'] = progress
+            if total is not None:
+                state['total'] = total
+            if processed is not None:
+                state['processed'] = processed
+            if paused is not None:
+                state['paused'] = paused
+            if message is not None:
+                state['message'] = message
+                # 记录历史消息
+                state['history'].append({
+                    'time': datetime.now().strftime('%H:%M:%S'),
+                    'message': message,
+                    'status': status or state['status']
+                })
 
 def update_statistics(audit_type, session_id, result, tags):
-    """更新统计数据 - 使用传入的session_id而非Flask session"""
+    """更新统计数据 - Counter直接累加，无需逐键判断是否存在"""
     if session_id in task_status[audit_type]:
-        # 更新结果统计
-        if result in task_status[audit_type][session_id]['statistics']['results']:
-            task_status[audit_type][session_id]['statistics']['results'][result] += 1
-        else:
-            task_status[audit_type][session_id]['statistics']['results'][result] = 1
-        
-        # 更新标签统计
-        for tag in tags:
-            if tag in task_status[audit_type][session_id]['statistics']['tags']:
-                task_status[audit_type][session_id]['statistics']['tags'][tag] += 1
-            else:
-                task_status[audit_type][session_id]['statistics']['tags'][tag] = 1
+        with _get_state_lock(audit_type, session_id):
+            statistics = task_status[audit_type][session_id]['statistics']
+            statistics['results'][result] += 1
+            statistics['tags'].update(tags)
+
+def update_statistics_bulk(audit_type, session_id, result_counter, tag_counter):
+    """批量合并统计数据 - 工作线程先本地累加，每批只拿一次锁"""
+    if not result_counter and not tag_counter:
+        return
+    if session_id in task_status[audit_type]:
+        with _get_state_lock(audit_type, session_id):
+            statistics = task_status[audit_type][session_id]['statistics']
+            statistics['results'].update(result_counter)
+            statistics['tags'].update(tag_counter)
 
 def get_upload_path(audit_type, session_id):
     """获取上传文件路径 - 使用传入的session_id而非Flask session"""
@@ -129,13 +328,54 @@ def get_result_path(audit_type, session_id):
     task_id = get_task_id(audit_type, session_id)
     return os.path.join(RESULT_FOLDER, "%s_%s_result.xlsx" % (audit_type, task_id))
 
+def _write_result_excel(df, path):
+    """写出结果xlsx - 优先用xlsxwriter的constant_memory流式模式"""
+    if _EXCEL_WRITE_ENGINE == 'xlsxwriter':
+        with pd.ExcelWriter(path, engine='xlsxwriter',
+                            engine_kwargs={'options': {'constant_memory': True}}) as writer:
+            df.to_excel(writer, index=False)
+    else:
+        df.to_excel(path, index=False)
+
+# 历史索引内存缓存：历史接口此前每次请求都同步读盘并解析JSON，
+# 会阻塞Flask工作线程；改为按文件mtime失效的进程内缓存，命中时零磁盘I/O
+_history_index_cache = {'mtime': None, 'data': []}
+_history_index_lock = Lock()
+
+def _load_history_index():
+    """读取历史索引 - 带mtime缓存，文件未变化时直接返回内存数据"""
+    try:
+        mtime = os.path.getmtime(HISTORY_INDEX_FILE)
+    except OSError:
+        return []
+    with _history_index_lock:
+        if _history_index_cache['mtime'] != mtime:
+            try:
+                with open(HISTORY_INDEX_FILE, 'r', encoding='utf-8') as f:
+                    _history_index_cache['data'] = json.load(f)
+            except:
+                _history_index_cache['data'] = []
+            _history_index_cache['mtime'] = mtime
+        return _history_index_cache['data']
+
+def _save_history_index(history_index):
+    """写入历史索引并同步刷新内存缓存"""
+    with _history_index_lock:
+        with open(HISTORY_INDEX_FILE, 'w', encoding='utf-8') as f:
+            json.dump(history_index, f, ensure_ascii=False, indent=2)
+        _history_index_cache['data'] = history_index
+        try:
+            _history_index_cache['mtime'] = os.path.getmtime(HISTORY_INDEX_FILE)
+        except OSError:
+            _history_index_cache['mtime'] = None
+
 # 修改 add_to_history 函数
 def add_to_history(audit_type, session_id, filename, total_rows, statistics):
     """添加到历史记录 - 使用文件系统持久化存储"""
     try:
         task_id = get_task_id(audit_type, session_id)
         result_path = get_result_path(audit_type, session_id)
-        
+
         # 创建历史记录条目
         history_entry = {
             'id': task_id,
@@ -147,23 +387,16 @@ def add_to_history(audit_type, session_id, filename, total_rows, statistics):
             'statistics': statistics,
             'status': 'completed'
         }
-        
-        # 加载现有索引
-        history_index = []
-        if os.path.exists(HISTORY_INDEX_FILE):
-            try:
-                with open(HISTORY_INDEX_FILE, 'r', encoding='utf-8') as f:
-                    history_index = json.load(f)
-            except:
-                history_index = []
-        
+
+        # 加载现有索引（复制一份，缓存中的列表不可原地修改）
+        history_index = list(_load_history_index())
+
         # 添加新记录到索引
         history_index.append(history_entry)
-        
+
         # 保存索引
-        with open(HISTORY_INDEX_FILE, 'w', encoding='utf-8') as f:
-            json.dump(history_index, f, ensure_ascii=False, indent=2)
-            
+        _save_history_index(history_index)
+
         # 同时保存详细记录到单独文件
         history_file = os.path.join(HISTORY_DIR, f"{task_id}.json")
         with open(history_file, 'w', encoding='utf-8') as f:
@@ -189,8 +422,7 @@ def get_history_page():
         if not os.path.exists(HISTORY_INDEX_FILE):
             return jsonify({'history': [], 'total': 0, 'pages': 0})
             
-        with open(HISTORY_INDEX_FILE, 'r', encoding='utf-8') as f:
-            all_history = json.load(f)
+        all_history = _load_history_index()
         
         # 过滤记录
         filtered_history = []
@@ -250,8 +482,7 @@ def get_history_statistics():
                 'by_volume': {}
             })
             
-        with open(HISTORY_INDEX_FILE, 'r', encoding='utf-8') as f:
-            all_history = json.load(f)
+        all_history = _load_history_index()
         
         # 过滤记录（按时间筛选）
         filtered_history = []
@@ -323,8 +554,7 @@ def export_history():
         if not os.path.exists(HISTORY_INDEX_FILE):
             return jsonify({'error': '没有历史记录可导出'}), 404
             
-        with open(HISTORY_INDEX_FILE, 'r', encoding='utf-8') as f:
-            all_history = json.load(f)
+        all_history = _load_history_index()
         
         filtered_history = []
         for record in all_history:
@@ -343,21 +573,26 @@ def export_history():
                     
             filtered_history.append(record)
         
-        # 根据格式导出
+        # 根据格式导出 - 直接流式写入响应体，不再落临时文件再send_file
+        export_ts = datetime.now().strftime('%Y%m%d_%H%M%S')
         if export_format == 'json':
-            export_path = os.path.join(HISTORY_DIR, f"export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
-            with open(export_path, 'w', encoding='utf-8') as f:
-                json.dump(filtered_history, f, ensure_ascii=False, indent=2)
-            return send_file(export_path, as_attachment=True)
-            
+            return Response(
+                json.dumps(filtered_history, ensure_ascii=False, indent=2),
+                mimetype='application/json',
+                headers={'Content-Disposition': 'attachment; filename=export_%s.json' % export_ts}
+            )
+
         elif export_format == 'csv':
-            export_path = os.path.join(HISTORY_DIR, f"export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
-            with open(export_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
+            def generate_csv():
+                buf = io.StringIO()
+                writer = csv.writer(buf)
                 # 写入标题行
                 writer.writerow(['ID', '任务类型', '执行时间', '文件名', '总行数', '正常数', '低质数', '处理失败数'])
-                
-                # 写入数据行
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate(0)
+
+                # 逐行生成数据，内存占用恒定
                 for record in filtered_history:
                     stats = record.get('statistics', {})
                     results = stats.get('results', {})
@@ -371,8 +606,15 @@ def export_history():
                         results.get('低质', 0),
                         results.get('处理失败', 0)
                     ])
-                    
-            return send_file(export_path, as_attachment=True)
+                    yield buf.getvalue()
+                    buf.seek(0)
+                    buf.truncate(0)
+
+            return Response(
+                generate_csv(),
+                mimetype='text/csv',
+                headers={'Content-Disposition': 'attachment; filename=export_%s.csv' % export_ts}
+            )
         else:
             return jsonify({'error': '不支持的导出格式'}), 400
             
@@ -397,34 +639,20 @@ def upload_file():
             return jsonify({'error': '审核类型和会话ID不能为空'}), 400
         
         # 修复审核类型验证
-        valid_audit_types = ['comment', 'cover', 'push', 'brand', 'news']
-        if audit_type not in valid_audit_types:
+        if audit_type not in _VALID_AUDIT_TYPES:
             return jsonify({
                 'error': '无效的审核类型: %s' % audit_type,
-                'valid_types': valid_audit_types
+                'valid_types': sorted(_VALID_AUDIT_TYPES)
             }), 400
         
         # 确保所有审核类型都有完整的任务状态结构
         if session_id not in task_status[audit_type]:
-            task_status[audit_type][session_id] = {
-                'id': str(uuid.uuid4()),
-                'status': 'idle',
-                'progress': 0,
-                'total': 0,
-                'processed': 0,
-                'paused': False,
-                'message': '',
-                'statistics': {
-                    'results': {},
-                    'tags': {}
-                },
-                'history': []
-            }
-            # 特殊字段初始化
+            # push巡检需要额外的会话与子任务跟踪字段
             if audit_type == 'push':
-                task_status[audit_type][session_id]['conversation_id'] = ''
-                task_status[audit_type][session_id]['subtasks'] = {}
-                task_status[audit_type][session_id]['completed_subtasks'] = 0
+                task_status[audit_type][session_id] = _new_task_state(
+                    conversation_id='', subtasks={}, completed_subtasks=0)
+            else:
+                task_status[audit_type][session_id] = _new_task_state()
         
         if 'file' not in request.files:
             return jsonify({'error': '未找到文件'}), 400
@@ -486,7 +714,7 @@ def run_task():
         if not audit_type:
             return jsonify({'error': '审核类型不能为空'}), 400
             
-        if audit_type not in ['comment', 'cover', 'push', 'brand', 'news']:
+        if audit_type not in _VALID_AUDIT_TYPES:
             return jsonify({'error': '无效的审核类型: %s' % audit_type}), 400
         
         if not session_id:
@@ -548,7 +776,7 @@ def get_status(audit_type):
     try:
         session_id = request.args.get('session_id')
         
-        if audit_type not in ['comment', 'cover', 'push', 'brand', 'news']:
+        if audit_type not in _VALID_AUDIT_TYPES:
             return jsonify({'error': '无效的审核类型'}), 400
         
         if session_id not in task_status[audit_type]:
@@ -564,7 +792,7 @@ def get_status(audit_type):
             'processed': status_data['processed'],
             'paused': status_data['paused'],
             'message': status_data['message'],
-            'history': status_data['history'][-10:] if status_data['history'] else []
+            'history': list(status_data['history'])[-10:] if status_data['history'] else []
         })
         
     except Exception as e:
@@ -581,10 +809,10 @@ def control_task():
         action = data.get('action')
         session_id = data.get('session_id')
         
-        if audit_type not in ['comment', 'cover', 'push', 'brand', 'news']:
+        if audit_type not in _VALID_AUDIT_TYPES:
             return jsonify({'error': '无效的审核类型'}), 400
         
-        if action not in ['pause', 'resume', 'finish', 'end']:
+        if action not in _VALID_ACTIONS:
             return jsonify({'error': '无效的操作'}), 400
         
         if session_id not in task_status[audit_type]:
@@ -607,20 +835,7 @@ def control_task():
             
         elif action == 'end':
             # 重置任务状态
-            task_status[audit_type][session_id] = {
-                'id': str(uuid.uuid4()),
-                'status': 'idle',
-                'progress': 0,
-                'total': 0,
-                'processed': 0,
-                'paused': False,
-                'message': '',
-                'statistics': {
-                    'results': {},
-                    'tags': {}
-                },
-                'history': []
-            }
+            task_status[audit_type][session_id] = _new_task_state()
             return jsonify({'message': '任务已结束'})
         
     except Exception as e:
@@ -633,23 +848,20 @@ def get_statistics(audit_type):
     try:
         session_id = request.args.get('session_id')
         
-        if audit_type not in ['comment', 'cover', 'push', 'brand', 'news']:
+        if audit_type not in _VALID_AUDIT_TYPES:
             return jsonify({'error': '无效的审核类型'}), 400
         
         if session_id not in task_status[audit_type]:
             return jsonify({'error': '任务不存在'}), 404
         
-        # 返回统计数据
+        # 返回统计数据的快照，不回写任务状态
         statistics = task_status[audit_type][session_id]['statistics']
-        
+
         # 确保结果和标签统计不为空
-        if not statistics['results']:
-            statistics['results'] = {'无数据': 0}
-        
-        if not statistics['tags']:
-            statistics['tags'] = {'无标签': 0}
-        
-        return jsonify(statistics)
+        results = dict(statistics['results']) or {'无数据': 0}
+        tags = dict(statistics['tags']) or {'无标签': 0}
+
+        return jsonify({'results': results, 'tags': tags})
         
     except Exception as e:
         logger.error("获取统计数据错误: %s" % str(e))
@@ -661,7 +873,7 @@ def download_result(audit_type):
     try:
         session_id = request.args.get('session_id')
         
-        if audit_type not in ['comment', 'cover', 'push', 'brand', 'news']:
+        if audit_type not in _VALID_AUDIT_TYPES:
             return jsonify({'error': '无效的审核类型'}), 400
         
         # 获取结果文件路径
@@ -679,9 +891,11 @@ def download_result(audit_type):
 
 @app.route('/history')
 def get_history():
-    """获取历史记录"""
+    """获取历史记录 - 从缓存索引返回最近50条"""
     try:
-        return jsonify({'history': history_records})
+        all_history = _load_history_index()
+        recent = sorted(all_history, key=lambda x: x['datetime'], reverse=True)[:50]
+        return jsonify({'history': recent})
         
     except Exception as e:
         logger.error("获取历史记录错误: %s" % str(e))
@@ -696,8 +910,7 @@ def download_history(history_id):
         if not os.path.exists(HISTORY_INDEX_FILE):
             return jsonify({'error': '历史记录不存在'}), 404
             
-        with open(HISTORY_INDEX_FILE, 'r', encoding='utf-8') as f:
-            all_history = json.load(f)
+        all_history = _load_history_index()
         
         # 查找历史记录
         target_record = None
@@ -730,8 +943,7 @@ def delete_history_record(history_id):
         if not os.path.exists(HISTORY_INDEX_FILE):
             return jsonify({"error": "历史记录索引文件不存在"}), 404
 
-        with open(HISTORY_INDEX_FILE, "r", encoding="utf-8") as f:
-            all_history = json.load(f)
+        all_history = _load_history_index()
 
         # 查找要删除的记录
         target_record = None
@@ -749,9 +961,8 @@ def delete_history_record(history_id):
         # 从索引中删除记录
         updated_history = [record for record in all_history if record["id"] != history_id]
 
-        # 保存更新后的索引
-        with open(HISTORY_INDEX_FILE, "w", encoding="utf-8") as f:
-            json.dump(updated_history, f, ensure_ascii=False, indent=2)
+        # 保存更新后的索引（同时刷新缓存）
+        _save_history_index(updated_history)
 
         # 删除对应的详细历史记录文件
         history_file = os.path.join(HISTORY_DIR, f"{history_id}.json")
@@ -799,13 +1010,7 @@ def scan_and_restore_history():
         
         all_task_ids = set(list(data_files.keys()) + list(result_files.keys()))
         
-        existing_index = []
-        if os.path.exists(HISTORY_INDEX_FILE):
-            try:
-                with open(HISTORY_INDEX_FILE, 'r', encoding='utf-8') as f:
-                    existing_index = json.load(f)
-            except:
-                existing_index = []
+        existing_index = list(_load_history_index())
         
         existing_ids = set(r.get('id', '').lower() for r in existing_index)
         
@@ -847,7 +1052,7 @@ def scan_and_restore_history():
                 
                 if has_result:
                     try:
-                        df = pd.read_excel(result_files[task_id]['path'], engine='openpyxl')
+                        df = pd.read_excel(result_files[task_id]['path'], engine=_EXCEL_READ_ENGINE)
                         total_rows = len(df)
                         
                         result_col = None
@@ -882,7 +1087,7 @@ def scan_and_restore_history():
                         
                 elif has_data:
                     try:
-                        df = pd.read_excel(data_files[task_id]['path'], engine='openpyxl')
+                        df = pd.read_excel(data_files[task_id]['path'], engine=_EXCEL_READ_ENGINE)
                         total_rows = len(df)
                     except:
                         pass
@@ -916,8 +1121,7 @@ def scan_and_restore_history():
                 logger.error("恢复任务 %s 失败: %s" % (task_id, str(e)))
                 continue
         
-        with open(HISTORY_INDEX_FILE, 'w', encoding='utf-8') as f:
-            json.dump(existing_index, f, ensure_ascii=False, indent=2)
+        _save_history_index(existing_index)
         
         return jsonify({
             'restored': len(restored),
@@ -935,7 +1139,7 @@ def process_comment_file(filename, api_keys, session_id):
     try:
         # 读取Excel文件
         update_task_status('comment', session_id, message='读取文件中...')
-        df = pd.read_excel(filename, engine='openpyxl')
+        df = pd.read_excel(filename, engine=_EXCEL_READ_ENGINE, dtype={'评论内容': 'string'})
         
         # 检查必要的列
         if '评论内容' not in df.columns:
@@ -1031,7 +1235,7 @@ def process_comment_file(filename, api_keys, session_id):
             
             # 保存最终结果
             result_path = get_result_path('comment', session_id)
-            final_df.to_excel(result_path, index=False)
+            _write_result_excel(final_df, result_path)
             
             # 更新任务状态
             update_task_status('comment', session_id, status='done', progress=100, 
@@ -1060,76 +1264,104 @@ def process_comment_chunk(chunk_df, api_key, session_id, chunk_index):
     try:
         # 复制数据块避免修改原数据
         df = chunk_df.copy()
-        
-        # 初始化结果列
-        df['审核结果'] = ''
-        df['违规标签'] = ''
-        df['审核时间'] = ''
-        df['处理批次'] = chunk_index + 1  # 标记处理批次
-        
+
+        # 标记处理批次
+        df['处理批次'] = chunk_index + 1
+
+        # 一次性取出评论列为数组，避免iterrows每行构造Series
+        comments = df['评论内容'].astype(str).to_numpy()
+        total_in_chunk = len(comments)
+
+        # 预分配结果数组，循环内按下标写入，最后整列赋回DataFrame
+        results = np.full(total_in_chunk, '', dtype=object)
+        tags_out = np.full(total_in_chunk, '', dtype=object)
+        times_out = np.full(total_in_chunk, '', dtype=object)
+
         # 更新子任务状态
         task_status['comment'][session_id]['subtasks'][chunk_index] = {
             'status': 'processing',
             'progress': 0,
-            'total': len(df),
+            'total': total_in_chunk,
             'processed': 0
         }
-        
-        # 逐行处理数据
-        for index, row in df.iterrows():
-            try:
-                # 检查主任务状态
-                if (session_id in task_status['comment'] and 
-                    task_status['comment'][session_id]['status'] != 'processing'):
-                    break
-                
-                # 处理内容
-                comment = str(row['评论内容']).strip()
-                result, tags = process_comment(comment, api_key)
-                
-                # 特殊处理：如果标签为"/"，则结果应为"正常"
-                if len(tags) == 0 or (len(tags) == 1 and tags[0] == '/'):
-                    result = '正常'
-                    tags = []
-                
-                # 更新结果
-                df.at[index, '审核结果'] = result
-                df.at[index, '违规标签'] = ', '.join(tags) if tags else '/'
-                df.at[index, '审核时间'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                
-                # 更新统计
-                update_statistics('comment', session_id, result, tags if tags else [])
-                
-                # 更新子任务进度
-                processed_count = index + 1
-                chunk_progress = int((processed_count / len(df)) * 100)
-                task_status['comment'][session_id]['subtasks'][chunk_index]['processed'] = processed_count
-                task_status['comment'][session_id]['subtasks'][chunk_index]['progress'] = chunk_progress
-                
-                # 添加间隔，避免请求过快
-                time.sleep(0.5)
-                
-            except Exception as e:
-                logger.error("评论处理错误(批次%d, 行%d): %s" % (chunk_index, index, str(e)))
-                
-                # 更新结果为处理失败
-                df.at[index, '审核结果'] = '处理失败'
-                df.at[index, '违规标签'] = '/'
-                df.at[index, '审核时间'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                
-                # 更新统计
-                update_statistics('comment', session_id, '处理失败', [])
-                
-                # 更新子任务进度
-                processed_count = index + 1
-                task_status['comment'][session_id]['subtasks'][chunk_index]['processed'] = processed_count
-                
-                continue
-        
+
+        # 进度更新与日志按1%粒度节流，避免每行都做字符串格式化和状态写入
+        log_every = max(1, total_in_chunk // 100)
+
+        # 行级并发：评论审核是纯I/O等待，块内再开线程池并发调用API
+        # 分批提交（每批32条），批间检查任务状态以便及时响应暂停/停止
+        batch_size = 32
+        processed_count = 0
+        # 统计先在本地Counter累加，每批结束合并一次共享状态
+        local_results = Counter()
+        local_tags = Counter()
+        row_executor = _AUDIT_EXECUTOR
+        for batch_start in range(0, total_in_chunk, batch_size):
+            # 检查主任务状态
+            if (session_id in task_status['comment'] and
+                task_status['comment'][session_id]['status'] != 'processing'):
+                break
+
+            batch_end = min(batch_start + batch_size, total_in_chunk)
+            row_futures = {
+                row_executor.submit(process_comment, comments[i].strip(), api_key): i
+                for i in range(batch_start, batch_end)
+            }
+
+            for future in as_completed(row_futures):
+                i = row_futures[future]
+                try:
+                    result, tags = future.result()
+
+                    # 特殊处理：如果标签为"/"，则结果应为"正常"
+                    if len(tags) == 0 or (len(tags) == 1 and tags[0] == '/'):
+                        result = '正常'
+                        tags = []
+
+                    # 更新结果
+                    results[i] = result
+                    tags_out[i] = ', '.join(tags) if tags else '/'
+                    times_out[i] = _now_str()
+
+                    # 更新统计（本地累加）
+                    local_results[result] += 1
+                    local_tags.update(tags if tags else [])
+
+                except Exception as e:
+                    logger.error("评论处理错误(批次%d, 行%d): %s" % (chunk_index, i, str(e)))
+
+                    # 更新结果为处理失败
+                    results[i] = '处理失败'
+                    tags_out[i] = '/'
+                    times_out[i] = _now_str()
+
+                    # 更新统计（本地累加）
+                    local_results['处理失败'] += 1
+
+                # 更新子任务进度（按1%粒度节流）
+                processed_count += 1
+                if processed_count % log_every == 0 or processed_count == total_in_chunk:
+                    chunk_progress = int((processed_count / total_in_chunk) * 100)
+                    task_status['comment'][session_id]['subtasks'][chunk_index]['processed'] = processed_count
+                    task_status['comment'][session_id]['subtasks'][chunk_index]['progress'] = chunk_progress
+                    # 先做级别判断再格式化，格式化参数延迟到真正输出时才求值
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info("[COMMENT] 批次%d 进度 %d/%d (%d%%)", chunk_index + 1, processed_count, total_in_chunk, chunk_progress)
+
+            # 每批合并一次统计，锁获取次数从每行一次降到每批一次
+            update_statistics_bulk('comment', session_id, local_results, local_tags)
+            local_results.clear()
+            local_tags.clear()
+
+        # 整列写回，避免循环内df.at逐格赋值
+        df['审核结果'] = results
+        df['违规标签'] = tags_out
+        df['审核时间'] = times_out
+
         # 标记子任务完成
         task_status['comment'][session_id]['subtasks'][chunk_index]['status'] = 'completed'
         task_status['comment'][session_id]['subtasks'][chunk_index]['progress'] = 100
-        
+
         return df
         
     except Exception as e:
@@ -1138,7 +1370,7 @@ def process_comment_chunk(chunk_df, api_key, session_id, chunk_index):
         df = chunk_df.copy()
         df['审核结果'] = '处理失败'
         df['违规标签'] = '/'
-        df['审核时间'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        df['审核时间'] = _now_str()
         df['处理批次'] = chunk_index + 1
         # 标记子任务失败
         task_status['comment'][session_id]['subtasks'][chunk_index]['status'] = 'error'
@@ -1146,6 +1378,12 @@ def process_comment_chunk(chunk_df, api_key, session_id, chunk_index):
 
 def process_comment(comment, api_key):
     """处理单条评论 - 修复版本，解决API结果解析问题"""
+    # 重复评论直接命中内容缓存，跳过API往返
+    cache_key = _audit_cache_key('comment', comment)
+    cached = _audit_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
     # 最大重试次数
     max_retries = 3
     retry_count = 0
@@ -1163,26 +1401,26 @@ def process_comment(comment, api_key):
             }
             
             # 发送请求
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": "Bearer %s" % api_key
-            }
-            
-            logger.info("评论审核请求数据: %s" % json.dumps(data))
-            
-            # 发送请求，添加3000秒超时机制
-            response = requests.post(
-                API_URL, 
-                headers=headers, 
-                json=data, 
-                timeout=api_timeout
-            )
+            headers = _auth_headers(api_key)
+            
+            # 级别关闭时跳过json.dumps序列化
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("评论审核请求数据: %s", json.dumps(data))
+            
+            # 发送请求，添加3000秒超时机制（走共享连接池，信号量限流）
+            with _api_semaphore:
+                response = API_SESSION.post(
+                    API_URL,
+                    headers=headers,
+                    json=data,
+                    timeout=api_timeout
+                )
             
-            logger.info("评论审核响应状态: %d" % response.status_code)
+            logger.info("评论审核响应状态: %d", response.status_code)
             
             # 处理非200状态码
             if response.status_code != 200:
-                logger.error("评论审核响应错误: %s" % response.text)
+                logger.error("评论审核响应错误: %s", response.text)
                 # 特殊处理501错误
                 if response.status_code == 501 and "conversation_id" in response.text:
                     retry_count += 1
@@ -1193,14 +1431,15 @@ def process_comment(comment, api_key):
                 response.raise_for_status()
             
             # 解析响应
-            result_data = response.json()
+            result_data = _json_loads(response.content)
             assistant_message = result_data.get('answer', '')
-            logger.info("评论审核原始响应: %s" % assistant_message)
+            logger.info("评论审核原始响应: %s", assistant_message)
             
             # 解析API返回结果
             result, tags = parse_audit_result(assistant_message)
             
-            logger.info("评论审核解析结果: %s, 标签: %s" % (result, tags))
+            logger.info("评论审核解析结果: %s, 标签: %s", result, tags)
+            _audit_cache_put(cache_key, result, tags)
             return result, tags
             
         except requests.exceptions.Timeout as timeout_err:
@@ -1246,7 +1485,7 @@ def process_push_file(filename, api_keys, session_id):
     try:
         # 读取Excel文件
         update_task_status('push', session_id, message='读取文件中...')
-        df = pd.read_excel(filename, engine='openpyxl')
+        df = pd.read_excel(filename, engine=_EXCEL_READ_ENGINE, dtype={'标题': 'string', '摘要': 'string'})
         
         # 检查必要的列
         if '标题' not in df.columns or '摘要' not in df.columns:
@@ -1341,7 +1580,7 @@ def process_push_file(filename, api_keys, session_id):
             
             # 保存最终结果
             result_path = get_result_path('push', session_id)
-            final_df.to_excel(result_path, index=False)
+            _write_result_excel(final_df, result_path)
             
             # 更新任务状态
             update_task_status('push', session_id, status='done', progress=100, 
@@ -1371,12 +1610,8 @@ def process_push_chunk(chunk_df, api_key, session_id, chunk_index):
         # 复制数据块避免修改原数据
         df = chunk_df.copy()
         
-        # 初始化结果列
-        df['审核结果'] = ''
-        df['低质标签'] = ''
-        df['审核时间'] = ''
         df['处理批次'] = chunk_index + 1  # 标记处理批次
-        
+
         # 初始化会话ID
         conversation_id = ''
         
@@ -1388,8 +1623,20 @@ def process_push_chunk(chunk_df, api_key, session_id, chunk_index):
             'processed': 0
         }
         
-        # 逐行处理数据
-        for index, row in df.iterrows():
+        # 一次性取出标题/摘要列为数组，避免iterrows每行构造Series
+        titles = df['标题'].astype(str).to_numpy()
+        summaries = df['摘要'].astype(str).to_numpy()
+        total_in_chunk = len(titles)
+        # 统计先本地累加，随进度去抖一起合并到共享状态
+        local_results = Counter()
+        local_tags = Counter()
+        res_arr = np.full(total_in_chunk, '', dtype=object)
+        tag_arr = np.full(total_in_chunk, '', dtype=object)
+        time_arr = np.full(total_in_chunk, '', dtype=object)
+        last_status_update = 0.0  # 子任务进度去抖
+
+        # 逐行处理数据（conversation_id逐行串联，保持顺序执行）
+        for pos in range(total_in_chunk):
             try:
                 # 检查主任务状态
                 if (session_id in task_status['push'] and 
@@ -1397,8 +1644,8 @@ def process_push_chunk(chunk_df, api_key, session_id, chunk_index):
                     break
                 
                 # 处理内容
-                title = str(row['标题']).strip()
-                summary = str(row['摘要']).strip()
+                title = titles[pos].strip()
+                summary = summaries[pos].strip()
                 
                 # 审核内容
                 response = audit_content_batch(title, summary, api_key, conversation_id)
@@ -1406,40 +1653,51 @@ def process_push_chunk(chunk_df, api_key, session_id, chunk_index):
                 tags = response.get('tags', [])
                 conversation_id = response.get('conversation_id', conversation_id)
                 
-                # 更新结果
-                df.at[index, '审核结果'] = result
-                df.at[index, '低质标签'] = ', '.join(tags) if tags else '/'
-                df.at[index, '审核时间'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                
-                # 更新统计
-                update_statistics('push', session_id, result, tags if tags else [])
-                
-                # 更新子任务进度
-                processed_count = index + 1
-                chunk_progress = int((processed_count / len(df)) * 100)
-                task_status['push'][session_id]['subtasks'][chunk_index]['processed'] = processed_count
-                task_status['push'][session_id]['subtasks'][chunk_index]['progress'] = chunk_progress
-                
-                # 添加间隔，避免请求过快
-                time.sleep(0.5)
+                res_arr[pos] = result
+                tag_arr[pos] = ', '.join(tags) if tags else '/'
+                time_arr[pos] = _now_str()
+                
+                # 更新统计（本地累加）
+                local_results[result] += 1
+                local_tags.update(tags if tags else [])
+                
+                # 更新子任务进度（最多每0.5秒写一次，末行必写）
+                processed_count = pos + 1
+                now = time.monotonic()
+                if processed_count == total_in_chunk or now - last_status_update > 0.5:
+                    chunk_progress = int((processed_count / total_in_chunk) * 100)
+                    task_status['push'][session_id]['subtasks'][chunk_index]['processed'] = processed_count
+                    task_status['push'][session_id]['subtasks'][chunk_index]['progress'] = chunk_progress
+                    update_statistics_bulk('push', session_id, local_results, local_tags)
+                    local_results.clear()
+                    local_tags.clear()
+                    last_status_update = now
                 
             except Exception as e:
-                logger.error("Push处理错误(批次%d, 行%d): %s" % (chunk_index, index, str(e)))
+                logger.error("Push处理错误(批次%d, 行%d): %s" % (chunk_index, pos, str(e)))
                 
-                # 更新结果为处理失败
-                df.at[index, '审核结果'] = '处理失败'
-                df.at[index, '低质标签'] = '/'
-                df.at[index, '审核时间'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                # 记录为处理失败
+                res_arr[pos] = '处理失败'
+                tag_arr[pos] = '/'
+                time_arr[pos] = _now_str()
                 
-                # 更新统计
-                update_statistics('push', session_id, '处理失败', [])
+                # 更新统计（本地累加）
+                local_results['处理失败'] += 1
                 
                 # 更新子任务进度
-                processed_count = index + 1
+                processed_count = pos + 1
                 task_status['push'][session_id]['subtasks'][chunk_index]['processed'] = processed_count
                 
                 continue
         
+        # 合并剩余统计（提前break时去抖可能漏掉尾部）
+        update_statistics_bulk('push', session_id, local_results, local_tags)
+
+        # 整列写回全部结果（三次整列赋值替代逐格/逐批loc写入）
+        df['审核结果'] = res_arr
+        df['低质标签'] = tag_arr
+        df['审核时间'] = time_arr
+
         # 标记子任务完成
         task_status['push'][session_id]['subtasks'][chunk_index]['status'] = 'completed'
         task_status['push'][session_id]['subtasks'][chunk_index]['progress'] = 100
@@ -1452,7 +1710,7 @@ def process_push_chunk(chunk_df, api_key, session_id, chunk_index):
         df = chunk_df.copy()
         df['审核结果'] = '处理失败'
         df['低质标签'] = '/'
-        df['审核时间'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        df['审核时间'] = _now_str()
         df['处理批次'] = chunk_index + 1
         # 标记子任务失败
         task_status['push'][session_id]['subtasks'][chunk_index]['status'] = 'error'
@@ -1460,10 +1718,13 @@ def process_push_chunk(chunk_df, api_key, session_id, chunk_index):
 
 def audit_content_batch(title, summary, api_key, conversation_id=''):
     """执行双字段内容审核（批量版本）"""
-    headers = {
-        "Authorization": "Bearer %s" % api_key,
-        "Content-Type": "application/json"
-    }
+    # 标题+摘要联合哈希命中缓存时直接返回，conversation_id保持不变
+    cache_key = _audit_cache_key('push', '%s\x01%s' % (title, summary))
+    cached = _audit_cache_get(cache_key)
+    if cached is not None:
+        return {'result': cached[0], 'tags': cached[1], 'conversation_id': conversation_id}
+
+    headers = _auth_headers(api_key)
     
     payload = {
         "query": sanitize_fields(title, summary),
@@ -1473,21 +1734,22 @@ def audit_content_batch(title, summary, api_key, conversation_id=''):
         "response_mode": "blocking"
     }
     
-    session = create_retry_session()
     try:
-        response = session.post(
-            API_URL,
-            headers=headers,
-            json=payload,
-            timeout=TIMEOUT
-        )
+        with _api_semaphore:
+            response = API_SESSION.post(
+                API_URL,
+                headers=headers,
+                json=payload,
+                timeout=TIMEOUT
+            )
         response.raise_for_status()
         
-        response_data = response.json()
+        response_data = _json_loads(response.content)
         new_conversation_id = response_data.get("conversation_id", '')
         answer = response_data.get("answer", "")
         
         result, tags = parse_audit_result_push(answer)
+        _audit_cache_put(cache_key, result, tags)
         
         return {
             'result': result,
@@ -1507,171 +1769,99 @@ def sanitize_fields(title, summary):
     def clean_text(text):
         if pd.isnull(text):
             return ""
-        return re.sub(r'[\x00-\x1F\\"{}]', '', str(text))[:1500]
+        return _SANITIZE_RE.sub('', str(text))[:1500]
     
     clean_title = clean_text(title)
     clean_summary = clean_text(summary)
-    return "标题：%s\n摘要：%s" % (clean_title, clean_summary)[:3000]
+    # 截断必须作用在拼好的字符串上；原写法的[:3000]先对元组切片，上限形同虚设
+    return f"标题：{clean_title}\n摘要：{clean_summary}"[:3000]
 
-def parse_audit_result_push(assistant_message):
-    """精准解析审核结果（增强版）"""
-        
-    # 最大重试次数
-    MAX_RETRIES = 3
-    TIMEOUT = 1500 
-    try:
-        # 1. 过滤think标签内容
-        think_pattern = r'<think>.*?</think>'
-        filtered_message = re.sub(think_pattern, '', assistant_message, flags=re.DOTALL).strip()
-        logger.info("过滤后内容: %s..." % filtered_message[:200])
-        
-        # 2. 定义多种解析模式
-        patterns = [
-            # 模式1：带编号的标准格式
-            (r'（1）\s*审核结果\s*[:：]\s*(\S+)', r'（2）\s*低质标签\s*[:：]\s*(.+?)(?=\n|$)'),
-            # 模式2：不带编号的格式
-            (r'审核结果\s*[:：]\s*(\S+)', r'低质标签\s*[:：]\s*(.+?)(?=\n|$)'),
-            # 模式3：简化格式
-            (r'(?:审核结果|结果)\s*[:：]?\s*(正常|低质|违规)', r'(?:低质标签|标签|违规标签)\s*[:：]?\s*(.+?)(?=\n|$)')
-        ]
-        
-        result = "解析失败"
-        tags = []
-        
-        # 3. 尝试每种模式
-        for result_pattern, tag_pattern in patterns:
-            result_match = re.search(result_pattern, filtered_message, re.IGNORECASE)
-            tag_match = re.search(tag_pattern, filtered_message, re.IGNORECASE)
-            
-            if result_match and tag_match:
+def _parse_audit_core(assistant_message, fallback_extract=False):
+    """共享的审核结果解析：过滤think标签、预编译模式匹配、关键词兜底
+
+    fallback_extract: 结果为低质但未解析出标签时，是否从内容中提取标签（评论流程使用）
+    """
+    result = "解析失败"
+    tags = []
+
+    # 第一步：过滤think标签内容
+    filtered_message = _THINK_RE.sub('', assistant_message).strip()
+    logger.info("过滤think标签后的内容: %s", filtered_message[:200])
+
+    # 快速路径：绝大多数内容审核为"正常"且无标签，直接返回省去逐个正则匹配
+    if (filtered_message in ('正常', '审核结果：正常', '审核结果:正常') or
+            (len(filtered_message) < 30 and '正常' in filtered_message and
+             '违规' not in filtered_message and '低质' not in filtered_message)):
+        return '正常', []
+
+    # 第二步：依次尝试预编译的解析模式，结果和标签独立匹配
+    result_found = False
+    tag_found = False
+
+    for i, (result_pattern, tag_pattern) in enumerate(zip(_RESULT_PATTERNS, _TAG_PATTERNS)):
+        if not result_found:
+            result_match = result_pattern.search(filtered_message)
+            if result_match:
                 result = result_match.group(1).strip()
+                result_found = True
+                logger.info("使用模式%d成功解析结果: %s", i+1, result)
+
+        if not tag_found:
+            tag_match = tag_pattern.search(filtered_message)
+            if tag_match:
                 tag_str = tag_match.group(1).strip()
                 tags = parse_tags(tag_str)
-                logger.info("匹配成功: 结果=%s, 标签=%s" % (result, tags))
-                break
-        
-        # 4. 备用策略：关键词匹配
-        if result == "解析失败":
-            if '正常' in filtered_message and '违规' not in filtered_message and '低质' not in filtered_message:
-                result = '正常'
-            elif '低质' in filtered_message or '违规' in filtered_message:
-                result = '低质'
-            logger.info("关键词匹配: 结果=%s" % result)
-        
-        # 5. 后处理
-        if result == '正常':
-            tags = []  # 正常内容不应有标签
-            
-        return result, tags
-        
+                tag_found = True
+                logger.info("使用模式%d成功解析标签: %s", i+1, tags)
+
+    # 第三步：备用解析策略 - 基于关键词匹配
+    if not result_found:
+        if '正常' in filtered_message and ('违规' not in filtered_message and '低质' not in filtered_message):
+            result = '正常'
+            logger.info("使用关键词匹配解析结果: 正常")
+        elif '低质' in filtered_message or '违规' in filtered_message:
+            result = '低质'
+            logger.info("使用关键词匹配解析结果: 低质")
+
+    # 第四步：特殊处理逻辑
+    # 如果结果是正常，确保标签为空
+    if result == '正常':
+        tags = []
+
+    # 如果标签只有"/"或"无"等，清空标签列表
+    if len(tags) == 1 and tags[0] in ['/', '无', '无标签', '']:
+        tags = []
+
+    # 如果结果是低质但没有标签，尝试从内容中提取
+    if fallback_extract and result == '低质' and not tags:
+        tags = extract_tags_from_content(filtered_message)
+
+    logger.info("最终解析结果: 结果=%s, 标签=%s", result, tags)
+    return result, tags
+
+def parse_audit_result_push(assistant_message):
+    """解析推送审核结果"""
+    try:
+        return _parse_audit_core(assistant_message)
     except Exception as e:
         logger.error("解析异常: %s" % str(e))
         return ("解析失败", [])
 
-def create_retry_session():
-    """创建带重试机制的请求会话"""
-    session = requests.Session()
-    retry = Retry(
-        total=MAX_RETRIES,
-        backoff_factor=1,
-        status_forcelist=[500, 502, 503, 504]
-    )
-    adapter = HTTPAdapter(max_retries=retry)
-    session.mount('http://', adapter)
-    session.mount('https', adapter)
-    return session
-
 def parse_audit_result(assistant_message):
-    """解析审核结果 - 修复版本，支持多种格式和增强错误处理"""
-    result = "解析失败"
-    tags = []
-    
+    """解析评论审核结果，低质且无标签时回退到内容关键词提取"""
     try:
-        # 第一步：过滤think标签内容
-        think_pattern = r'<think>.*?</think>'
-        filtered_message = re.sub(think_pattern, '', assistant_message, flags=re.DOTALL).strip()
-        
-        logger.info("过滤think标签后的内容: %s" % filtered_message)
-        
-        # 第二步：尝试多种正则表达式模式解析结果
-        
-        # 模式1：带编号的标准格式 （1）审核结果：xxx （2）低质标签：xxx
-        pattern1_result = r'（1）\s*审核结果\s*[:：]\s*(\S+)'
-        pattern1_tag = r'（2）\s*低质标签\s*[:：]\s*(.+?)(?=\n|$)'
-        
-        # 模式2：不带编号的格式 审核结果：xxx 低质标签：xxx
-        pattern2_result = r'审核结果\s*[:：]\s*(\S+)'
-        pattern2_tag = r'低质标签\s*[:：]\s*(.+?)(?=\n|$)'
-        
-        # 模式3：简化格式，只有结果和标签值
-        pattern3_result = r'(?:审核结果|结果)\s*[:：]?\s*(正常|低质|违规)'
-        pattern3_tag = r'(?:低质标签|标签|违规标签)\s*[:：]?\s*(.+?)(?=\n|$)'
-        
-        # 尝试解析结果
-        result_patterns = [pattern1_result, pattern2_result, pattern3_result]
-        tag_patterns = [pattern1_tag, pattern2_tag, pattern3_tag]
-        
-        result_found = False
-        tag_found = False
-        
-        # 尝试每种模式
-        for i, (result_pattern, tag_pattern) in enumerate(zip(result_patterns, tag_patterns)):
-            if not result_found:
-                result_match = re.search(result_pattern, filtered_message, re.IGNORECASE)
-                if result_match:
-                    result = result_match.group(1).strip()
-                    result_found = True
-                    logger.info("使用模式%d成功解析结果: %s" % (i+1, result))
-            
-            if not tag_found:
-                tag_match = re.search(tag_pattern, filtered_message, re.IGNORECASE)
-                if tag_match:
-                    tag_str = tag_match.group(1).strip()
-                    tags = parse_tags(tag_str)
-                    tag_found = True
-                    logger.info("使用模式%d成功解析标签: %s" % (i+1, tags))
-        
-        # 第三步：备用解析策略 - 基于关键词匹配
-        if not result_found:
-            if '正常' in filtered_message and ('违规' not in filtered_message and '低质' not in filtered_message):
-                result = '正常'
-                result_found = True
-                logger.info("使用关键词匹配解析结果: 正常")
-            elif '低质' in filtered_message or '违规' in filtered_message:
-                result = '低质'
-                result_found = True
-                logger.info("使用关键词匹配解析结果: 低质")
-        
-        # 第四步：特殊处理逻辑
-        # 如果结果是正常，确保标签为空
-        if result == '正常':
-            tags = []
-        
-        # 如果标签只有"/"或"无"等，清空标签列表
-        if len(tags) == 1 and tags[0] in ['/', '无', '无标签', '']:
-            tags = []
-        
-        # 如果结果是低质但没有标签，尝试从内容中提取
-        if result == '低质' and not tags:
-            tags = extract_tags_from_content(filtered_message)
-        
-        logger.info("最终解析结果: 结果=%s, 标签=%s" % (result, tags))
-        
+        return _parse_audit_core(assistant_message, fallback_extract=True)
     except Exception as e:
-        logger.error("解析审核结果时发生异常: %s" % str(e))
-        result = "处理失败"
-        tags = []
-    
-    return result, tags
+        logger.error("解析审核结果时发生异常: %s", str(e))
+        return ("处理失败", [])
 
 def parse_tags(tag_str):
     """解析标签字符串，返回标签列表"""
     if not tag_str or tag_str.strip() in ['/', '无', '无标签', '']:
         return []
     
-    # 清理标签字符串，支持多种分隔符
-    tag_str = tag_str.replace('，', ',').replace('、', ',').replace('；', ',').replace(';', ',')
-    tag_str = tag_str.replace('/', '').strip()
+    # 清理标签字符串，支持多种分隔符（一次translate替代多次replace扫描）
+    tag_str = tag_str.translate(_SEP_TABLE).replace('/', '').strip()
     
     if not tag_str:
         return []
@@ -1687,28 +1877,28 @@ def parse_tags(tag_str):
     
     return valid_tags
 
+# 标签关键词表：构建一次，匹配用单个正则交替式一趟扫完，替代逐关键词substring搜索
+_TAG_KEYWORDS = {
+    '涉政': ['涉政', '政治', '政策'],
+    '违禁': ['违禁', '非法'],
+    '色情': ['色情', '性'],
+    '低俗': ['低俗', '低级'],
+    '广告': ['广告', '推广'],
+    '谩骂': ['谩骂', '辱骂', '歧视'],
+    '灌水': ['灌水', '无意义']
+}
+_KEYWORD_TO_TAG = {kw: tag for tag, kws in _TAG_KEYWORDS.items() for kw in kws}
+_TAG_KEYWORD_RE = re.compile('|'.join(
+    re.escape(kw) for kw in sorted(_KEYWORD_TO_TAG, key=len, reverse=True)))
+
+
 def extract_tags_from_content(content):
     """从内容中提取可能的违规标签"""
-    # 定义可能的标签关键词
-    tag_keywords = {
-        '涉政': ['涉政', '政治', '政策'],
-        '违禁': ['违禁', '非法'],
-        '色情': ['色情', '性'],
-        '低俗': ['低俗', '低级'],
-        '广告': ['广告', '推广'],
-        '谩骂': ['谩骂', '辱骂', '歧视'],
-        '灌水': ['灌水', '无意义']
-    }
-    
     found_tags = []
-    content_lower = content.lower()
-    
-    for tag, keywords in tag_keywords.items():
-        for keyword in keywords:
-            if keyword in content_lower:
-                found_tags.append(tag)
-                break
-    
+    for match in _TAG_KEYWORD_RE.finditer(content.lower()):
+        tag = _KEYWORD_TO_TAG[match.group(0)]
+        if tag not in found_tags:
+            found_tags.append(tag)
     return found_tags
 
 # ================ 其他巡检功能保持不变 ================
@@ -1725,7 +1915,7 @@ def process_cover_file(filename, api_keys, session_id):
         
         # 读取Excel文件
         update_task_status('cover', session_id, message='读取文件中...')
-        df = pd.read_excel(filename, engine='openpyxl')
+        df = pd.read_excel(filename, engine=_EXCEL_READ_ENGINE, dtype={'封面链接': 'string'})
         
         # 检查必要的列
         if '封面链接' not in df.columns:
@@ -1734,85 +1924,117 @@ def process_cover_file(filename, api_keys, session_id):
         
         # 数据清洗
         update_task_status('cover', session_id, message='开始数据清洗...')
-        df = df.dropna(subset=['封面链接'])
-        df = df[df['封面链接'].astype(str).str.strip() != '']
-        
-        # 初始化结果列
-        df['审核结果'] = ''
-        df['违规标签'] = ''
-        df['审核时间'] = ''
+        col = df['封面链接']
+        mask = col.notna() & (col.astype('string').str.strip().fillna('') != '')
+        df = df.loc[mask].reset_index(drop=True)
         
         total_rows = len(df)
+        # 结果预分配为numpy对象数组，按位置写入，写检查点/最终保存时整列赋回
+        res_arr = np.full(total_rows, '', dtype=object)
+        tag_arr = np.full(total_rows, '', dtype=object)
+        time_arr = np.full(total_rows, '', dtype=object)
         update_task_status('cover', session_id, total=total_rows, message='数据准备完成，开始处理 %d 条封面链接' % total_rows)
-        
-        # 逐行处理数据
-        for index, row in df.iterrows():
-            try:
-                # 检查是否暂停
-                while task_status['cover'][session_id]['paused']:
-                    time.sleep(0.5)
-                    # 检查是否已结束任务
-                    if task_status['cover'][session_id]['status'] == 'idle':
-                        return
-                
-                # 检查任务状态
-                if task_status['cover'][session_id]['status'] != 'processing':
-                    break
-                
-                # 更新进度
-                processed = index + 1
-                progress = int((processed / total_rows) * 100)
-                update_task_status('cover', session_id, progress=progress, processed=processed, message='开始处理项目 #%d/%d' % (index+1, total_rows))
-                
-                # 处理封面
-                cover_url = row['封面链接']
-                result, tags = process_cover(cover_url, api_key, index, session_id)
-                
-                # 特殊处理：如果标签为"/"，则结果应为"正常"
-                if len(tags) == 0 or (len(tags) == 1 and tags[0] == '/'):
-                    result = '正常'
-                    tags = []
-                
-                # 更新结果
-                df.at[index, '审核结果'] = result
-                df.at[index, '违规标签'] = ', '.join(tags) if tags else '/'
-                df.at[index, '审核时间'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                
-                # 更新统计
-                update_statistics('cover', session_id, result, tags if tags else [])
-                
-                # 每条处理完成后保存一次结果，确保不丢失进度
-                result_path = get_result_path('cover', session_id)
-                df.to_excel(result_path, index=False)
-                
-                # 添加处理完成日志
-                update_task_status('cover', session_id, message='项目 #%d/%d 处理完成，结果: %s' % (index+1, total_rows, result), status='processing')
-                
-                # 添加间隔，避免请求过快
-                time.sleep(1)
-                
-            except Exception as e:
-                logger.error("封面处理项目 #%d 错误: %s" % (index, str(e)))
-                update_task_status('cover', session_id, message='项目 #%d 处理异常: %s，继续处理下一项' % (index+1, str(e)), status='warning')
-                
-                # 更新结果为处理失败
-                df.at[index, '审核结果'] = '处理失败'
-                df.at[index, '违规标签'] = '/'
-                df.at[index, '审核时间'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                
-                # 更新统计
-                update_statistics('cover', session_id, '处理失败', [])
-                
-                # 保存当前结果
-                result_path = get_result_path('cover', session_id)
-                df.to_excel(result_path, index=False)
-                
-                # 继续处理下一条，不中断循环
-                continue
-        
-        # 保存最终结果
+
+        # 行级并发：封面审核是纯网络等待，使用有界线程池并发提交
+        # 分批提交（每批32条），批间检查暂停/停止并落盘一次结果
+        batch_size = 32
+        indices = list(df.index)
+        # 一次性取出链接列为数组，提交任务时不再逐格读DataFrame
+        urls = df['封面链接'].astype(str).to_numpy()
+        processed = 0
+        last_status_update = 0.0  # 进度上报去抖，避免每行都做一次跨线程状态合并
+        results_buffer = []  # (索引, 结果, 标签, 时间)，每批结束统一写回
+        # 统计先本地累加，每批结束合并一次共享状态
+        local_results = Counter()
+        local_tags = Counter()
+        executor = _AUDIT_EXECUTOR
+        for batch_start in range(0, total_rows, batch_size):
+            # 检查是否暂停
+            while task_status['cover'][session_id]['paused']:
+                time.sleep(0.5)
+                # 检查是否已结束任务
+                if task_status['cover'][session_id]['status'] == 'idle':
+                    return
+
+            # 检查任务状态
+            if task_status['cover'][session_id]['status'] != 'processing':
+                break
+
+            batch_end = min(batch_start + batch_size, total_rows)
+            futures = {
+                executor.submit(process_cover, urls[pos], api_key, indices[pos], session_id): indices[pos]
+                for pos in range(batch_start, batch_end)
+            }
+
+            for future in as_completed(futures):
+                idx = futures[future]
+                try:
+                    result, tags = future.result()
+
+                    # 特殊处理：如果标签为"/"，则结果应为"正常"
+                    if len(tags) == 0 or (len(tags) == 1 and tags[0] == '/'):
+                        result = '正常'
+                        tags = []
+
+                    # 暂存结果，批末统一写回
+                    results_buffer.append((idx, result, ', '.join(tags) if tags else '/',
+                                           _now_str()))
+
+                    # 更新统计（本地累加）
+                    local_results[result] += 1
+                    local_tags.update(tags if tags else [])
+
+                except Exception as e:
+                    logger.error("封面处理项目 #%d 错误: %s" % (idx, str(e)))
+
+                    # 记录为处理失败
+                    results_buffer.append((idx, '处理失败', '/',
+                                           _now_str()))
+
+                    # 更新统计（本地累加）
+                    local_results['处理失败'] += 1
+
+                # 更新进度（最多每0.5秒上报一次，最后一行必上报）
+                processed += 1
+                now = time.monotonic()
+                if processed == total_rows or now - last_status_update > 0.5:
+                    progress = int((processed / total_rows) * 100)
+                    update_task_status('cover', session_id, progress=progress, processed=processed,
+                                      message='项目 #%d/%d 处理完成' % (processed, total_rows), status='processing')
+                    last_status_update = now
+
+            # 批量写回本批结果（numpy数组按位置写入，绕开block manager逐格检查）
+            if results_buffer:
+                idxs, res_vals, tag_vals, time_vals = zip(*results_buffer)
+                pos_list = list(idxs)  # 数据清洗后索引已重置，标签即位置
+                res_arr[pos_list] = res_vals
+                tag_arr[pos_list] = tag_vals
+                time_arr[pos_list] = time_vals
+                results_buffer.clear()
+            df['审核结果'] = res_arr
+            df['违规标签'] = tag_arr
+            df['审核时间'] = time_arr
+
+            # 每批合并一次统计，锁获取次数从每行一次降到每批一次
+            update_statistics_bulk('cover', session_id, local_results, local_tags)
+            local_results.clear()
+            local_tags.clear()
+
+            # 每批处理完成后写一份CSV检查点，确保不丢失进度
+            # （xlsx每次都是全量XML重写，检查点用CSV快一个量级，最终结果仍输出xlsx）
+            result_path = get_result_path('cover', session_id)
+            df.to_csv(result_path + '.ckpt.csv', index=False)
+        
+        # 保存最终结果（再整列赋回一次，保证空输入时结果列也存在）
+        df['审核结果'] = res_arr
+        df['违规标签'] = tag_arr
+        df['审核时间'] = time_arr
         result_path = get_result_path('cover', session_id)
-        df.to_excel(result_path, index=False)
+        _write_result_excel(df, result_path)
+
+        # 最终结果已落盘，移除CSV检查点
+        if os.path.exists(result_path + '.ckpt.csv'):
+            os.remove(result_path + '.ckpt.csv')
         
         # 更新任务状态
         update_task_status('cover', session_id, status='done', progress=100, message='封面审核完成，请点击完成按钮')
@@ -1830,10 +2052,6 @@ def process_cover_file(filename, api_keys, session_id):
 
 def process_cover(cover_url, api_key, index, session_id):
     """处理单条封面链接 - 适配新的API接口"""
-    # 应用速率限制
-    update_task_status('cover', session_id, message='项目 #%d 应用速率限制...' % (index+1))
-    time.sleep(1)  # 确保请求间隔至少1秒
-    
     # 最大重试次数
     max_retries = 3
     retry_count = 0
@@ -1855,10 +2073,7 @@ def process_cover(cover_url, api_key, index, session_id):
             }
             
             # 发送请求
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": "Bearer %s" % api_key  # 保持Bearer和密钥之间的空格
-            }
+            headers = _auth_headers(api_key)
             
             # 打印请求数据用于调试
             logger.info("封面审核请求数据: %s" % json.dumps(data))
@@ -1868,7 +2083,8 @@ def process_cover(cover_url, api_key, index, session_id):
             
             # 发送请求
             update_task_status('cover', session_id, message='项目 #%d 发送请求 (尝试 %d/%d)...' % (index+1, retry_count+1, max_retries))
-            response = requests.post(API_URL, headers=headers, json=data)
+            with _api_semaphore:
+                response = API_SESSION.post(API_URL, headers=headers, json=data)
             
             # 打印响应状态和内容用于调试
             logger.info("封面审核响应状态: %d" % response.status_code)
@@ -1886,7 +2102,7 @@ def process_cover(cover_url, api_key, index, session_id):
             response.raise_for_status()
             
             # 解析响应
-            result_data = response.json()
+            result_data = _json_loads(response.content)
             assistant_message = result_data.get('answer', '')
             
             # 保存conversation_id以便后续使用
@@ -1967,7 +2183,7 @@ def process_brand_file(filename, api_keys, session_id):
         
         # 读取Excel文件
         update_task_status('brand', session_id, message='读取文件中...')
-        df = pd.read_excel(filename, engine='openpyxl')
+        df = pd.read_excel(filename, engine=_EXCEL_READ_ENGINE, dtype={'品牌标题': 'string'})
         
         # 检查必要的列
         if '品牌标题' not in df.columns:
@@ -1976,76 +2192,111 @@ def process_brand_file(filename, api_keys, session_id):
         
         # 数据清洗
         update_task_status('brand', session_id, message='开始数据清洗...')
-        df = df.dropna(subset=['品牌标题'])
-        df = df[df['品牌标题'].astype(str).str.strip() != '']
-        
-        # 初始化结果列
-        df['审核结果'] = ''
-        df['违规标签'] = ''
-        df['审核时间'] = ''
+        col = df['品牌标题']
+        mask = col.notna() & (col.astype('string').str.strip().fillna('') != '')
+        df = df.loc[mask].reset_index(drop=True)
         
         total_rows = len(df)
+        # 结果预分配为numpy对象数组，按位置写入，写检查点/最终保存时整列赋回
+        res_arr = np.full(total_rows, '', dtype=object)
+        tag_arr = np.full(total_rows, '', dtype=object)
+        time_arr = np.full(total_rows, '', dtype=object)
         update_task_status('brand', session_id, total=total_rows, message='数据准备完成，开始处理 %d 条品牌内容' % total_rows)
-        
-        # 逐行处理数据
-        for index, row in df.iterrows():
-            try:
-                # 检查是否暂停
-                while task_status['brand'][session_id]['paused']:
-                    time.sleep(0.5)
-                    if task_status['brand'][session_id]['status'] == 'idle':
-                        return
-                
-                # 检查任务状态
-                if task_status['brand'][session_id]['status'] != 'processing':
-                    break
-                
-                # 更新进度
-                processed = index + 1
-                progress = int((processed / total_rows) * 100)
-                update_task_status('brand', session_id, progress=progress, processed=processed, 
-                                  message='开始处理品牌内容 #%d/%d' % (index+1, total_rows))
-                
-                # 处理内容
-                content = row['品牌标题']
-                result, tags = process_brand_content(content, api_key)
-                
-                # 更新结果
-                df.at[index, '审核结果'] = result
-                df.at[index, '违规标签'] = ', '.join(tags) if tags else '/'
-                df.at[index, '审核时间'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                
-                # 更新统计
-                update_statistics('brand', session_id, result, tags if tags else [])
-                
-                # 保存进度
-                result_path = get_result_path('brand', session_id)
-                df.to_excel(result_path, index=False)
-                
-                # 添加间隔
+
+        # 行级并发：品牌审核同样是网络I/O等待，线程池并发提交
+        # 分批提交（每批32条），批间检查暂停/停止并落盘一次结果
+        batch_size = 32
+        indices = list(df.index)
+        # 一次性取出标题列为数组，提交任务时不再逐格读DataFrame
+        contents = df['品牌标题'].astype(str).to_numpy()
+        processed = 0
+        last_status_update = 0.0  # 进度上报去抖，避免每行都做一次跨线程状态合并
+        results_buffer = []  # (索引, 结果, 标签, 时间)，每批结束统一写回
+        # 统计先本地累加，每批结束合并一次共享状态
+        local_results = Counter()
+        local_tags = Counter()
+        executor = _AUDIT_EXECUTOR
+        for batch_start in range(0, total_rows, batch_size):
+            # 检查是否暂停
+            while task_status['brand'][session_id]['paused']:
                 time.sleep(0.5)
-                
-            except Exception as e:
-                logger.error("品牌守护处理错误: %s" % str(e))
-                update_task_status('brand', session_id, message='品牌内容 #%d 处理异常: %s，继续处理下一项' % (index+1, str(e)), status='warning')
-                
-                # 更新结果为处理失败
-                df.at[index, '审核结果'] = '处理失败'
-                df.at[index, '违规标签'] = '/'
-                df.at[index, '审核时间'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                
-                # 更新统计
-                update_statistics('brand', session_id, '处理失败', [])
-                
-                # 保存当前结果
-                result_path = get_result_path('brand', session_id)
-                df.to_excel(result_path, index=False)
-                
-                continue
-        
-        # 保存最终结果
+                if task_status['brand'][session_id]['status'] == 'idle':
+                    return
+
+            # 检查任务状态
+            if task_status['brand'][session_id]['status'] != 'processing':
+                break
+
+            batch_end = min(batch_start + batch_size, total_rows)
+            futures = {
+                executor.submit(process_brand_content, contents[pos], api_key): indices[pos]
+                for pos in range(batch_start, batch_end)
+            }
+
+            for future in as_completed(futures):
+                idx = futures[future]
+                try:
+                    result, tags = future.result()
+
+                    # 暂存结果，批末统一写回
+                    results_buffer.append((idx, result, ', '.join(tags) if tags else '/',
+                                           _now_str()))
+
+                    # 更新统计（本地累加）
+                    local_results[result] += 1
+                    local_tags.update(tags if tags else [])
+
+                except Exception as e:
+                    logger.error("品牌守护处理错误: %s" % str(e))
+
+                    # 记录为处理失败
+                    results_buffer.append((idx, '处理失败', '/',
+                                           _now_str()))
+
+                    # 更新统计（本地累加）
+                    local_results['处理失败'] += 1
+
+                # 更新进度（最多每0.5秒上报一次，最后一行必上报）
+                processed += 1
+                now = time.monotonic()
+                if processed == total_rows or now - last_status_update > 0.5:
+                    progress = int((processed / total_rows) * 100)
+                    update_task_status('brand', session_id, progress=progress, processed=processed,
+                                      message='品牌内容 #%d/%d 处理完成' % (processed, total_rows), status='processing')
+                    last_status_update = now
+
+            # 批量写回本批结果（numpy数组按位置写入，绕开block manager逐格检查）
+            if results_buffer:
+                idxs, res_vals, tag_vals, time_vals = zip(*results_buffer)
+                pos_list = list(idxs)  # 数据清洗后索引已重置，标签即位置
+                res_arr[pos_list] = res_vals
+                tag_arr[pos_list] = tag_vals
+                time_arr[pos_list] = time_vals
+                results_buffer.clear()
+            df['审核结果'] = res_arr
+            df['违规标签'] = tag_arr
+            df['审核时间'] = time_arr
+
+            # 每批合并一次统计，锁获取次数从每行一次降到每批一次
+            update_statistics_bulk('brand', session_id, local_results, local_tags)
+            local_results.clear()
+            local_tags.clear()
+
+            # 每批处理完成后写一份CSV检查点，确保不丢失进度
+            # （xlsx每次都是全量XML重写，检查点用CSV快一个量级，最终结果仍输出xlsx）
+            result_path = get_result_path('brand', session_id)
+            df.to_csv(result_path + '.ckpt.csv', index=False)
+        
+        # 保存最终结果（再整列赋回一次，保证空输入时结果列也存在）
+        df['审核结果'] = res_arr
+        df['违规标签'] = tag_arr
+        df['审核时间'] = time_arr
         result_path = get_result_path('brand', session_id)
-        df.to_excel(result_path, index=False)
+        _write_result_excel(df, result_path)
+
+        # 最终结果已落盘，移除CSV检查点
+        if os.path.exists(result_path + '.ckpt.csv'):
+            os.remove(result_path + '.ckpt.csv')
         
         # 更新任务状态
         update_task_status('brand', session_id, status='done', progress=100, message='品牌守护审核完成，请点击完成按钮')
@@ -2063,6 +2314,12 @@ def process_brand_file(filename, api_keys, session_id):
 
 def process_brand_content(content, api_key):
     """处理单条品牌内容"""
+    # 重复品牌内容直接命中内容缓存
+    cache_key = _audit_cache_key('brand', str(content))
+    cached = _audit_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
     max_retries = 3
     retry_count = 0
     api_timeout = (10, 3000)
@@ -2078,17 +2335,15 @@ def process_brand_content(content, api_key):
             }
             
             # 发送请求
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": "Bearer %s" % api_key
-            }
-            
-            response = requests.post(
-                API_URL, 
-                headers=headers, 
-                json=data, 
-                timeout=api_timeout
-            )
+            headers = _auth_headers(api_key)
+            
+            with _api_semaphore:
+                response = API_SESSION.post(
+                    API_URL,
+                    headers=headers,
+                    json=data,
+                    timeout=api_timeout
+                )
             
             if response.status_code != 200:
                 if response.status_code == 501 and "conversation_id" in response.text:
@@ -2098,11 +2353,12 @@ def process_brand_content(content, api_key):
                 response.raise_for_status()
             
             # 解析响应
-            result_data = response.json()
+            result_data = _json_loads(response.content)
             assistant_message = result_data.get('answer', '')
             
             # 解析API返回结果
             result, tags = parse_audit_result(assistant_message)
+            _audit_cache_put(cache_key, result, tags)
             
             return result, tags
             
@@ -2134,10 +2390,15 @@ def process_news_file(filename, combined_api_key, session_id):
         api_key_info_extract = api_keys[0]  # 信息读取Agent
         api_key_image_audit = api_keys[1]   # 图片审核Agent
         api_key_text_audit = api_keys[2]    # 文本审核Agent
+
+        # 每次任务开始时清空URL级缓存，避免跨上传使用过期数据
+        with _news_info_cache_lock:
+            _news_info_cache.clear()
+        check_image_size.cache_clear()
         
         # 读取Excel文件
         update_task_status('news', session_id, message='读取文件中...')
-        df = pd.read_excel(filename, engine='openpyxl')
+        df = pd.read_excel(filename, engine=_EXCEL_READ_ENGINE, dtype={'资讯链接': 'string'})
         
         # 检查必要的列
         if '资讯链接' not in df.columns:
@@ -2147,86 +2408,132 @@ def process_news_file(filename, combined_api_key, session_id):
         
         # 数据清洗
         update_task_status('news', session_id, message='开始数据清洗...')
-        df = df.dropna(subset=['资讯链接'])
-        df = df[df['资讯链接'].astype(str).str.strip() != '']
-        
-        # 初始化结果列
-        df['审核结果'] = ''
-        df['违规标签'] = ''
-        df['提取图片数量'] = ''
-        df['跳过小图片数量'] = ''  # 新增：记录跳过的图片数量
-        df['图片审核详情'] = ''
-        df['文本审核结果'] = ''
-        df['文本违规标签'] = ''
-        df['审核时间'] = ''
+        col = df['资讯链接']
+        mask = col.notna() & (col.astype('string').str.strip().fillna('') != '')
+        df = df.loc[mask].reset_index(drop=True)
+        
+        # 初始化结果列（一次assign替代8次逐列插入，每次插入都会重排内部块）
+        result_cols = ['审核结果', '违规标签', '提取图片数量', '跳过小图片数量',
+                       '图片审核详情', '文本审核结果', '文本违规标签', '审核时间']
+        df = df.assign(**dict.fromkeys(result_cols, ''))
         
         total_rows = len(df)
         update_task_status('news', session_id, total=total_rows, 
                          message=f'数据准备完成，开始处理 {total_rows} 条资讯链接')
         
-        # 逐行处理数据
-        for index, row in df.iterrows():
-            try:
+        # 行级并发：单条资讯要串联多次远程调用，几乎全程在等网络
+        # 分批提交（每批8条），批间检查暂停/停止并落盘一次进度
+        batch_size = 8
+        indices = list(df.index)
+        processed = 0
+        last_status_update = 0.0
+        results_buffer = {}  # {行索引: {列: 值}}，每批结束统一写回
+        
+        # 检查点改为追加式CSV，由独立写盘线程消费，处理线程不再等待磁盘
+        ckpt_path = get_result_path('news', session_id) + '.ckpt.csv'
+        write_queue = queue.Queue(maxsize=128)
+        
+        def _ckpt_writer():
+            with open(ckpt_path, 'w', newline='', encoding='utf-8') as f:
+                ckpt_writer = csv.writer(f)
+                ckpt_writer.writerow(['行号'] + result_cols)
+                while True:
+                    item = write_queue.get()
+                    if item is None:
+                        break
+                    ckpt_writer.writerow(item)
+                    f.flush()
+        
+        writer_thread = threading.Thread(target=_ckpt_writer, daemon=True)
+        writer_thread.start()
+        
+        executor = _AUDIT_EXECUTOR
+        try:
+            for batch_start in range(0, total_rows, batch_size):
                 # 检查任务状态
                 if task_status['news'][session_id]['status'] != 'processing':
                     break
-                
+            
                 # 检查暂停状态
                 while task_status['news'][session_id]['paused']:
                     time.sleep(0.5)
                     if task_status['news'][session_id]['status'] == 'idle':
                         return
-                
-                # 更新进度
-                processed = index + 1
-                progress = int((processed / total_rows) * 100)
-                update_task_status('news', session_id, progress=progress, processed=processed, 
-                                 message=f'开始处理资讯 #{index+1}/{total_rows}')
-                
-                # 处理资讯内容
-                news_url = row['资讯链接']
-                logger.info(f"处理资讯 #{index+1}: {news_url}")
-                
-                # 调用修复版处理函数（集成图片尺寸检查）
-                result_data = process_news_item_complete(
-                    news_url=news_url,
-                    api_key_info_extract=api_key_info_extract,
-                    api_key_image_audit=api_key_image_audit,
-                    api_key_text_audit=api_key_text_audit,
-                    session_id=session_id
-                )
-                
-                # 更新结果
-                df.at[index, '审核结果'] = result_data['final_result']
-                df.at[index, '违规标签'] = ', '.join(result_data['final_tags'])
-                df.at[index, '提取图片数量'] = result_data['image_count']
-                df.at[index, '跳过小图片数量'] = result_data.get('skipped_small_images', 0)
-                df.at[index, '图片审核详情'] = format_image_results(
-                    result_data['image_results'], 
-                    result_data.get('skipped_small_images', 0)
-                 )
-                df.at[index, '文本审核结果'] = result_data['text_result']
-                df.at[index, '文本违规标签'] = ', '.join(result_data['text_tags'])
-                df.at[index, '审核时间'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                                
-                # 更新统计
-                update_statistics('news', session_id, result_data['final_result'], 
-                                result_data['final_tags'])
-                
-                # 实时保存进度
-                result_path = get_result_path('news', session_id)
-                df.to_excel(result_path, index=False)
-                
-                logger.info(f"资讯 #{index+1} 处理完成: {result_data['final_result']}")
-                
-            except Exception as e:
-                logger.error(f"资讯处理错误 #{index+1}: {str(e)}")
-                handle_processing_error(df, index, session_id, str(e))
-                continue
-        
+            
+                batch = indices[batch_start:batch_start + batch_size]
+                futures = {
+                    executor.submit(
+                        process_news_item_complete,
+                        news_url=df.at[idx, '资讯链接'],
+                        api_key_info_extract=api_key_info_extract,
+                        api_key_image_audit=api_key_image_audit,
+                        api_key_text_audit=api_key_text_audit,
+                        session_id=session_id
+                    ): idx
+                    for idx in batch
+                }
+            
+                for future in as_completed(futures):
+                    index = futures[future]
+                    try:
+                        result_data = future.result()
+                    
+                        # 暂存结果，批末统一写回（8列逐格df.at是主线程的CPU热点）
+                        results_buffer[index] = {
+                            '审核结果': result_data['final_result'],
+                            '违规标签': ', '.join(result_data['final_tags']),
+                            '提取图片数量': result_data['image_count'],
+                            '跳过小图片数量': result_data.get('skipped_small_images', 0),
+                            '图片审核详情': format_image_results(
+                                result_data['image_results'], 
+                                result_data.get('skipped_small_images', 0)
+                            ),
+                            '文本审核结果': result_data['text_result'],
+                            '文本违规标签': ', '.join(result_data['text_tags']),
+                            '审核时间': _now_str(),
+                        }
+                    
+                        # 更新统计
+                        update_statistics('news', session_id, result_data['final_result'], 
+                                        result_data['final_tags'])
+                    
+                        logger.info(f"资讯 #{index+1} 处理完成: {result_data['final_result']}")
+                    
+                    except Exception as e:
+                        logger.error(f"资讯处理错误 #{index+1}: {str(e)}")
+                        handle_processing_error(results_buffer, index, session_id, str(e))
+                
+                    # 行结果交给写盘线程追加到检查点
+                    row = results_buffer[index]
+                    write_queue.put([index] + [row[c] for c in result_cols])
+                
+                    # 更新进度（最多每0.5秒上报一次，最后一行必上报）
+                    processed += 1
+                    now = time.monotonic()
+                    if processed == total_rows or now - last_status_update > 0.5:
+                        progress = int((processed / total_rows) * 100)
+                        update_task_status('news', session_id, progress=progress, processed=processed, 
+                                         message=f'资讯 #{processed}/{total_rows} 处理完成')
+                        last_status_update = now
+            
+                # 批量写回本批结果（检查点由写盘线程增量追加，这里不再整表落盘）
+                if results_buffer:
+                    df.update(pd.DataFrame.from_dict(results_buffer, orient='index'))
+                    results_buffer.clear()
+
+        finally:
+            # 无论正常结束、暂停后提前返回还是抛出异常，都要收掉写盘线程，
+            # 否则它会一直阻塞在get()上并占着检查点文件
+            write_queue.put(None)
+            writer_thread.join(timeout=10)
+
         # 保存最终结果
         result_path = get_result_path('news', session_id)
-        df.to_excel(result_path, index=False)
+        _write_result_excel(df, result_path)
+
+        # 最终结果已落盘，移除CSV检查点
+        if os.path.exists(ckpt_path):
+            os.remove(ckpt_path)
         
         # 更新任务状态
         update_task_status('news', session_id, status='done', progress=100, 
@@ -2275,60 +2582,100 @@ def process_news_item_complete(news_url, api_key_info_extract, api_key_image_aud
     text_content = extract_valid_content(raw_text_content)
     logger.info(f"截取后文本内容长度: {len(text_content)}")
     
-    # 步骤3: 审核所有图片（增加尺寸检查）
+    # 步骤3/4: 文本审核与图片审核互不依赖，并行提交后统一收取结果
+    text_future = None
+    if text_content and text_content != "文本提取失败":
+        text_future = _ITEM_EXECUTOR.submit(audit_news_text_fixed, text_content, api_key_text_audit)
+    
     if image_urls:
         logger.info(f"开始审核 {len(image_urls)} 张图片内容")
-        for i, image_url in enumerate(image_urls):
-            try:
-                update_task_status('news', session_id, message=f'正在检查图片 {i+1}/{len(image_urls)} 尺寸...')
-                
-                # 新增：检查图片尺寸
-                should_audit, size_info = check_image_size(image_url)
-                
-                if not should_audit:
-                    # 图片尺寸过小，跳过审核
-                    logger.info(f"图片 {i+1} 尺寸过小，跳过审核: {size_info}")
-                    skipped_small_images += 1
-                    continue  # 直接跳过，不记录任何结果
-                
-                update_task_status('news', session_id, message=f'正在审核图片 {i+1}/{len(image_urls)}...')
-                
-                # 修复：处理URL编码问题
-                clean_image_url = clean_image_url_for_api(image_url)
-                result, tags = audit_news_image_fixed(clean_image_url, api_key_image_audit)
-                
-                # 只记录违规图片的结果
-                if result == '违规':
-                    all_results.append(result)
-                    all_tags.extend(tags)
-                    # 记录图片审核详情
-                    image_audit_details.append({
-                        'index': i+1,
-                        'result': result,
-                        'tags': tags
-                    })
-                
-                logger.info(f"图片 {i+1}/{len(image_urls)} 审核完成: {result}, 标签: {tags}")
-                
-                # 添加间隔，避免请求过快
-                time.sleep(1)
-                
-            except Exception as e:
-                logger.error(f"图片 {i+1} 处理失败: {str(e)}")
-                # 处理失败的图片也记录下来
-                all_results.append('处理失败')
-                all_tags.append('图片处理失败')
-                continue
+        update_task_status('news', session_id, message=f'正在检查 {len(image_urls)} 张图片尺寸...')
+        
+        # 先并发做尺寸检查，筛出需要送审的图片
+        audit_list = []  # (原序号, 清理后URL)
+        size_futures = [_ITEM_EXECUTOR.submit(check_image_size, url) for url in image_urls]
+        for i, size_future in enumerate(size_futures):
+            should_audit, size_info = size_future.result()
+            if not should_audit:
+                # 图片尺寸过小，跳过审核
+                logger.info(f"图片 {i+1} 尺寸过小，跳过审核: {size_info}")
+                skipped_small_images += 1
+                continue  # 直接跳过，不记录任何结果
+            # 修复：处理URL编码问题
+            audit_list.append((i, clean_image_url_for_api(image_urls[i])))
+        
+        if audit_list:
+            update_task_status('news', session_id, message=f'正在审核 {len(audit_list)} 张图片...')
+            
+            # 一次请求送审全部图片，N次网络往返合并为1次
+            batch_results = audit_news_images_batch([url for _, url in audit_list],
+                                                    api_key_image_audit)
+            
+            if batch_results is not None:
+                for (i, _), (result, tags) in zip(audit_list, batch_results):
+                    # 只记录违规图片的结果
+                    if result == '违规':
+                        all_results.append(result)
+                        all_tags.extend(tags)
+                        image_audit_details.append({
+                            'index': i+1,
+                            'result': result,
+                            'tags': tags
+                        })
+                    logger.info(f"图片 {i+1}/{len(image_urls)} 审核完成: {result}, 标签: {tags}")
+            else:
+                # 批量审核不可用（接口或解析失败），退回逐张并发审核
+                logger.warning("批量图片审核不可用，退回逐张审核")
+                image_futures = {
+                    _ITEM_EXECUTOR.submit(audit_news_image_fixed, url, api_key_image_audit): i
+                    for i, url in audit_list
+                }
+                # 任一图片违规即可判定整条资讯违规，出现违规后提前收尾
+                violation_found = False
+                pending = set(image_futures)
+                while pending and not violation_found:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        i = image_futures[future]
+                        try:
+                            result, tags = future.result()
+                            
+                            # 只记录违规图片的结果
+                            if result == '违规':
+                                all_results.append(result)
+                                all_tags.extend(tags)
+                                image_audit_details.append({
+                                    'index': i+1,
+                                    'result': result,
+                                    'tags': tags
+                                })
+                                violation_found = True
+                            
+                            logger.info(f"图片 {i+1}/{len(image_urls)} 审核完成: {result}, 标签: {tags}")
+                            
+                        except Exception as e:
+                            logger.error(f"图片 {i+1} 处理失败: {str(e)}")
+                            # 处理失败的图片也记录下来
+                            all_results.append('处理失败')
+                            all_tags.append('图片处理失败')
+                
+                if violation_found and pending:
+                    # 结论已定，取消尚未开始的图片审核请求
+                    logger.info(f"已判定违规，取消剩余 {len(pending)} 张图片的审核")
+                    for future in pending:
+                        future.cancel()
+                
+                # 完成顺序不定，详情按图片序号排回
+                image_audit_details.sort(key=lambda d: d['index'])
     else:
         logger.warning("没有提取到图片链接")
         all_results.append('无图片')
         all_tags.append('无图片')
     
-    # 步骤4: 审核文本内容
-    if text_content and text_content != "文本提取失败":
+    # 收取文本审核结果
+    if text_future is not None:
         try:
-            update_task_status('news', session_id, message='正在审核文本内容...')
-            text_audit_result, text_audit_tags = audit_news_text_fixed(text_content, api_key_text_audit)
+            text_audit_result, text_audit_tags = text_future.result()
             all_results.append(text_audit_result)
             all_tags.extend(text_audit_tags)
             logger.info(f"文本审核完成: {text_audit_result}, 标签: {text_audit_tags}")
@@ -2360,58 +2707,141 @@ def process_news_item_complete(news_url, api_key_info_extract, api_key_image_aud
         'text_tags': text_audit_tags
     }
 
+def _peek_dims(data):
+    """直接从文件头字节解析图片宽高，常见格式不经过PIL解码
+
+    支持PNG(IHDR)、GIF、JPEG(SOFn标记)、WebP(VP8X/VP8/VP8L)；无法识别返回None
+    """
+    if len(data) < 24:
+        return None
+    
+    # PNG: 8字节签名 + IHDR块，宽高位于偏移16处的两个大端32位
+    if data[:8] == b'\x89PNG\r\n\x1a\n':
+        return struct.unpack('>II', data[16:24])
+    
+    # GIF: 宽高位于偏移6处的两个小端16位
+    if data[:6] in (b'GIF87a', b'GIF89a'):
+        return struct.unpack('<HH', data[6:10])
+    
+    # JPEG: 逐段扫描找SOFn标记（C4/C8/CC不是帧头）
+    if data[:2] == b'\xff\xd8':
+        pos = 2
+        n = len(data)
+        while pos + 9 < n:
+            if data[pos] != 0xFF:
+                pos += 1
+                continue
+            marker = data[pos + 1]
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                height, width = struct.unpack('>HH', data[pos + 5:pos + 9])
+                return width, height
+            seg_len = int.from_bytes(data[pos + 2:pos + 4], 'big')
+            if seg_len < 2:
+                return None
+            pos += 2 + seg_len
+        return None
+    
+    # WebP: RIFF容器，按第一个chunk类型取宽高
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        fourcc = data[12:16]
+        if fourcc == b'VP8X' and len(data) >= 30:
+            width = int.from_bytes(data[24:27], 'little') + 1
+            height = int.from_bytes(data[27:30], 'little') + 1
+            return width, height
+        if fourcc == b'VP8 ' and len(data) >= 30:
+            width, height = struct.unpack('<HH', data[26:30])
+            return width & 0x3FFF, height & 0x3FFF
+        if fourcc == b'VP8L' and len(data) >= 25:
+            bits = int.from_bytes(data[21:25], 'little')
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    
+    return None
+
+_read_buf_local = threading.local()
+
+def _read_capped(response, limit):
+    """流式读取响应体，最多读limit字节——部分服务器会忽略Range头返回整图
+
+    bytearray.extend是均摊O(1)追加，不会像bytes拼接那样每块整体复制；
+    缓冲区按线程复用，高并发下不必每次检查都重新分配
+    """
+    buf = getattr(_read_buf_local, 'buf', None)
+    if buf is None:
+        buf = _read_buf_local.buf = bytearray()
+    else:
+        buf.clear()
+    for chunk in response.iter_content(chunk_size=8192):
+        buf.extend(chunk)
+        if len(buf) >= limit:
+            break
+    response.close()
+    return bytes(buf)
+
+@lru_cache(maxsize=4096)
 def check_image_size(image_url):
-    """检查图片尺寸，如果长或宽小于600像素则跳过审核"""
+    """检查图片尺寸，如果长或宽小于600像素则跳过审核
+
+    同一站点的台标/广告图会在多篇资讯间反复出现，按URL缓存检查结果
+    """
     try:
-        # 发送HEAD请求获取图片信息，避免下载整个图片
-        response = requests.head(image_url, timeout=5)
-        
-        # 检查是否支持获取尺寸信息
-        if 'content-length' in response.headers:
-            content_length = int(response.headers.get('content-length', 0))
-            # 如果图片很小，直接判断为小图片
-            if content_length < 1024:  # 小于1KB的图片很可能是小图片
-                return False, "图片尺寸过小"
-        
-        # 对于不支持HEAD请求或需要实际下载的情况，使用GET请求但限制数据量
-        response = requests.get(image_url, stream=True, timeout=10)
+        # 尺寸信息位于图片文件头部，Range请求只取前16KB，
+        # 省去HEAD往返（不少CDN对HEAD支持不全），也不再下载整图
+        response = API_SESSION.get(image_url, headers={'Range': 'bytes=0-16383'},
+                                   timeout=5, stream=True)
         response.raise_for_status()
+        head = _read_capped(response, 16384)
+        
+        # 常见格式直接从文件头解析宽高，PIL只作少见格式的兜底
+        dims = _peek_dims(head)
+        if dims is None:
+            if not _PIL_AVAILABLE:
+                logger.warning(f"无法从文件头识别图片格式且PIL未安装，继续审核: {image_url}")
+                return True, "无法识别图片格式，继续审核"
+            try:
+                dims = Image.open(io.BytesIO(head)).size
+            except UnidentifiedImageError:
+                # 头部数据不足以识别格式时，再取一段更大的范围兜底
+                response = API_SESSION.get(image_url, headers={'Range': 'bytes=0-131071'},
+                                           timeout=10, stream=True)
+                response.raise_for_status()
+                dims = Image.open(io.BytesIO(_read_capped(response, 131072))).size
         
-        # 只读取前1MB数据来检查图片尺寸
-        img_data = b""
-        for chunk in response.iter_content(chunk_size=8192):
-            img_data += chunk
-            if len(img_data) > 1024 * 1024:  # 最多读取1MB
-                break
+        width, height = dims
+        logger.info(f"图片尺寸检查: {image_url} - {width}x{height}")
         
-        # 使用PIL检查图片尺寸
-        try:
-            from PIL import Image
-            import io
-            
-            img = Image.open(io.BytesIO(img_data))
-            width, height = img.size
-            
-            logger.info(f"图片尺寸检查: {image_url} - {width}x{height}")
-            
-            # 如果长或宽小于200像素，返回False
-            if width < 600 or height < 600:
-                return False, f"图片尺寸过小({width}x{height})"
-            else:
-                return True, f"图片尺寸合格({width}x{height})"
-                
-        except ImportError:
-            # 如果PIL不可用，默认继续审核
-            logger.warning("PIL库未安装，无法检查图片尺寸，继续审核")
-            return True, "PIL不可用，继续审核"
+        if width < 600 or height < 600:
+            return False, f"图片尺寸过小({width}x{height})"
+        else:
+            return True, f"图片尺寸合格({width}x{height})"
             
     except Exception as e:
         logger.warning(f"图片尺寸检查失败 {image_url}: {str(e)}")
         # 如果检查失败，默认继续审核（保守策略）
         return True, f"尺寸检查失败，继续审核: {str(e)}"
 
+# 资讯信息提取缓存：只记成功结果，失败的链接在重复出现时仍会重试
+# （与_audit_cache_put拒缓存失败结论的做法一致），每次任务开始时清空
+_news_info_cache = {}
+_news_info_cache_lock = Lock()
+
 def extract_news_info(news_url, api_key):
-    """信息读取Agent - 同时提取图片链接和文本内容"""
+    """信息读取Agent - 同时提取图片链接和文本内容
+
+    同一资讯链接在上传表格中重复出现时直接复用提取结果
+    """
+    with _news_info_cache_lock:
+        cached = _news_info_cache.get(news_url)
+    if cached is not None:
+        return cached
+    
+    news_info = _extract_news_info_uncached(news_url, api_key)
+    if news_info.get('content') != '信息提取失败':
+        with _news_info_cache_lock:
+            _news_info_cache[news_url] = news_info
+    return news_info
+
+def _extract_news_info_uncached(news_url, api_key):
+    """实际执行信息读取请求（带重试），由extract_news_info做缓存"""
     max_retries = 3
     retry_count = 0
     api_timeout = (10, 30000)
@@ -2425,28 +2855,26 @@ def extract_news_info(news_url, api_key):
                 "user": "news_info_extractor"
             }
             
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {api_key}"
-            }
+            headers = _auth_headers(api_key)
             
             logger.info(f"发送信息读取请求: {news_url}")
-            response = requests.post(
-                API_URL,
-                headers=headers,
-                json=data,
-                timeout=api_timeout
-            )
+            with _api_semaphore:
+                response = API_SESSION.post(
+                    API_URL,
+                    headers=headers,
+                    json=data,
+                    timeout=api_timeout
+                )
             
             if response.status_code != 200:
                 logger.error(f"信息读取响应错误: {response.status_code} - {response.text}")
                 if response.status_code == 501 and "conversation_id" in response.text:
                     retry_count += 1
-                    time.sleep(2)
+                    time.sleep(_backoff(retry_count))
                     continue
                 response.raise_for_status()
             
-            result_data = response.json()
+            result_data = _json_loads(response.content)
             assistant_message = result_data.get('answer', '')
             logger.info(f"信息读取原始响应: {assistant_message[:500]}...")
             
@@ -2460,7 +2888,7 @@ def extract_news_info(news_url, api_key):
             logger.error(f"提取资讯信息失败 (尝试 {retry_count}/{max_retries}): {str(e)}")
             if retry_count >= max_retries:
                 return {'images': [], 'content': '信息提取失败'}
-            time.sleep(2)
+            time.sleep(_backoff(retry_count))
     
     return {'images': [], 'content': '信息提取失败'}
 
@@ -2468,18 +2896,16 @@ def parse_news_info(message):
     """解析信息读取Agent返回的内容"""
     try:
         # 移除think标签
-        think_pattern = r'<think>.*?</think>'
-        cleaned_message = re.sub(think_pattern, '', message, flags=re.DOTALL)
+        cleaned_message = _THINK_RE.sub('', message)
         
         # 尝试直接解析JSON格式
-        import json
         # 查找大括号包裹的内容
-        json_match = re.search(r'\{[^}]*["\']images["\'][^}]*["\']content["\'][^}]*\}', cleaned_message, re.DOTALL)
+        json_match = _NEWS_JSON_RE.search(cleaned_message)
         if json_match:
             json_str = json_match.group(0)
             # 尝试解析JSON
             try:
-                parsed_data = json.loads(json_str)
+                parsed_data = _json_loads(json_str)
                 images = parsed_data.get('images', [])
                 content = parsed_data.get('content', '')
                 
@@ -2497,27 +2923,19 @@ def parse_news_info(message):
         content = ''
         
         # 提取images字段
-        images_match = re.search(r'["\']images["\']\s*:\s*\[([^\]]+)\]', cleaned_message)
+        images_match = _IMAGES_FIELD_RE.search(cleaned_message)
         if images_match:
             images_str = images_match.group(1)
             # 提取所有图片URL
-            image_urls = re.findall(r'["\']([^"\',]+)["\']', images_str)
+            image_urls = _QUOTED_ITEM_RE.findall(images_str)
             images = [url.strip() for url in image_urls if url.strip().startswith('http')]
         
-        # 如果没有找到images字段，直接提取URL
+        # 如果没有找到images字段，直接提取图片URL（扩展名/路径过滤并入正则一趟完成）
         if not images:
-            url_patterns = [
-                r'https?://[^\s<>"\)\]]+',  # 基础URL模式
-            ]
-            for pattern in url_patterns:
-                matches = re.findall(pattern, cleaned_message, re.IGNORECASE)
-                if matches:
-                    images = [url for url in matches if any(ext in url.lower() for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp', 'image'])]
-                    if images:
-                        break
+            images = _IMG_URL_RE.findall(cleaned_message)
         
         # 提取content字段
-        content_match = re.search(r'["\']content["\']\s*:\s*["\']([^"\']*)["\']', cleaned_message, re.DOTALL)
+        content_match = _CONTENT_FIELD_RE.search(cleaned_message)
         if content_match:
             content = content_match.group(1)
         else:
@@ -2526,7 +2944,7 @@ def parse_news_info(message):
             content = cleaned_message
             for img_url in images:
                 content = content.replace(img_url, '')
-            content = re.sub(r'["\']images["\']\s*:\s*\[[^\]]+\]', '', content)
+            content = _IMAGES_FIELD_RE.sub('', content)
             content = content.strip()
         
         logger.info(f"解析结果: 图片数量={len(images)}, 文本长度={len(content)}")
@@ -2541,23 +2959,11 @@ def extract_valid_content(raw_content):
     if not raw_content:
         return "文本提取失败"
     
-    # 查找截止关键词
-    stop_keywords = ['精彩推荐', '相关推荐', '全部评论', '我要举报']
-    
-    # 找到最早出现的截止关键词
-    earliest_pos = len(raw_content)
-    found_keyword = None
-    
-    for keyword in stop_keywords:
-        pos = raw_content.find(keyword)
-        if pos != -1 and pos < earliest_pos:
-            earliest_pos = pos
-            found_keyword = keyword
-    
-    # 截取内容
-    if found_keyword:
-        valid_content = raw_content[:earliest_pos].strip()
-        logger.info(f"在位置 {earliest_pos} 找到截止关键词 '{found_keyword}'，截取后内容长度: {len(valid_content)}")
+    # 查找最早出现的截止关键词并截取内容
+    match = _STOP_KEYWORDS_RE.search(raw_content)
+    if match:
+        valid_content = raw_content[:match.start()].strip()
+        logger.info(f"在位置 {match.start()} 找到截止关键词 '{match.group(0)}'，截取后内容长度: {len(valid_content)}")
     else:
         valid_content = raw_content.strip()
         logger.info(f"未找到截止关键词，使用全部内容，长度: {len(valid_content)}")
@@ -2572,8 +2978,6 @@ def clean_image_url_for_api(image_url):
     """清理图片URL，处理特殊字符问题"""
     try:
         # 对URL进行编码处理，但保留协议和域名部分
-        from urllib import quote
-        
         # 分离协议和路径
         if '://' in image_url:
             protocol, path = image_url.split('://', 1)
@@ -2583,10 +2987,111 @@ def clean_image_url_for_api(image_url):
         else:
             # 如果没有协议，直接编码
             return quote(image_url, safe='/:?=&')
-    except:
+    except UnicodeError:
         # 如果编码失败，返回原始URL
         return image_url
 
+def _parse_image_batch_results(message, expected):
+    """解析批量图片审核回复中的JSON数组，格式不符返回None以便退回逐张审核"""
+    filtered_message = _THINK_RE.sub('', message).strip()
+    array_match = _JSON_ARRAY_RE.search(filtered_message)
+    if not array_match:
+        return None
+    try:
+        items = _json_loads(array_match.group(0))
+    except ValueError:
+        return None
+    if not isinstance(items, list) or len(items) != expected:
+        return None
+    
+    parsed = []
+    for item in items:
+        if not isinstance(item, dict):
+            return None
+        result = str(item.get('result', '')).strip()
+        if result not in ('正常', '违规', '低质'):
+            return None
+        tags = item.get('tags', [])
+        if isinstance(tags, str):
+            tags = parse_tags(tags)
+        elif isinstance(tags, list):
+            tags = [str(t).strip() for t in tags
+                    if str(t).strip() and str(t).strip() not in ('/', '无', '无标签')]
+        else:
+            return None
+        if result == '正常':
+            tags = []
+        parsed.append((result, tags))
+    return parsed
+
+def audit_news_images_batch(image_urls, api_key):
+    """批量审核图片：一次请求携带全部图片，按序返回每张的(结果, 标签)
+
+    接口不支持或回复无法解析时返回None，由调用方退回逐张审核
+    """
+    max_retries = 3
+    retry_count = 0
+    
+    while retry_count < max_retries:
+        try:
+            data = {
+                "query": ("请逐张审核以下%d张图片内容是否违规，按图片顺序返回JSON数组，"
+                          "每项格式为{\"result\": \"正常/违规\", \"tags\": [\"标签\"]}：" % len(image_urls)),
+                "inputs": {},
+                "response_mode": "blocking",
+                "user": "news_image_auditor",
+                "upload_mediums": [
+                    {"url": image_url, "type": "image"}
+                    for image_url in image_urls
+                ]
+            }
+            
+            headers = _auth_headers(api_key)
+            
+            logger.info(f"发送批量图片审核请求: {len(image_urls)}张")
+            
+            with _api_semaphore:
+                response = API_SESSION.post(
+                    API_URL, 
+                    headers=headers, 
+                    json=data, 
+                    timeout=(10, 3000)
+                )
+            
+            if response.status_code != 200:
+                logger.error(f"批量图片审核响应错误: {response.status_code}")
+                if response.status_code == 501 and "conversation_id" in response.text:
+                    retry_count += 1
+                    time.sleep(_backoff(retry_count))
+                    continue
+                if response.status_code == 429:
+                    retry_count += 1
+                    retry_after = response.headers.get('Retry-After')
+                    delay = float(retry_after) if retry_after else _backoff(retry_count)
+                    time.sleep(delay)
+                    continue
+                # 其他错误不在批量路径上重试，直接退回逐张审核
+                return None
+            
+            result_data = _json_loads(response.content)
+            assistant_message = result_data.get('answer', '')
+            logger.info(f"批量图片审核原始响应: {assistant_message[:500]}...")
+            
+            return _parse_image_batch_results(assistant_message, len(image_urls))
+            
+        except requests.exceptions.RequestException as req_err:
+            retry_count += 1
+            logger.error(f"批量图片审核网络异常 (尝试 {retry_count}/{max_retries}): {str(req_err)}")
+            if retry_count >= max_retries:
+                return None
+            time.sleep(_backoff(retry_count))
+        
+        except Exception as e:
+            logger.error(f"批量图片审核异常: {str(e)}")
+            return None
+    
+    return None
+
 def audit_news_image_fixed(image_url, api_key):
     """审核单张图片 - 修复版（处理URL编码问题）"""
     max_retries = 3
@@ -2608,19 +3113,17 @@ def audit_news_image_fixed(image_url, api_key):
                 ]
             }
             
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {api_key}"
-            }
+            headers = _auth_headers(api_key)
             
             logger.info(f"发送图片审核请求: {image_url[:100]}...")  # 只记录前100个字符
             
-            response = requests.post(
-                API_URL, 
-                headers=headers, 
-                json=data, 
-                timeout=(10, 3000)
-            )
+            with _api_semaphore:
+                response = API_SESSION.post(
+                    API_URL, 
+                    headers=headers, 
+                    json=data, 
+                    timeout=(10, 3000)
+                )
             
             logger.info(f"图片审核响应状态: {response.status_code}")
             
@@ -2629,11 +3132,19 @@ def audit_news_image_fixed(image_url, api_key):
                 if response.status_code == 501 and "conversation_id" in response.text:
                     retry_count += 1
                     logger.warning(f"501错误触发重试 ({retry_count}/{max_retries})")
-                    time.sleep(2)
+                    time.sleep(_backoff(retry_count))
+                    continue
+                if response.status_code == 429:
+                    # 被限流时按服务端Retry-After等待，没有则退避重试
+                    retry_count += 1
+                    retry_after = response.headers.get('Retry-After')
+                    delay = float(retry_after) if retry_after else _backoff(retry_count)
+                    logger.warning(f"触发限流(429)，{delay:.1f}秒后重试 ({retry_count}/{max_retries})")
+                    time.sleep(delay)
                     continue
                 response.raise_for_status()
             
-            result_data = response.json()
+            result_data = _json_loads(response.content)
             assistant_message = result_data.get('answer', '')
             logger.info(f"图片审核原始响应: {assistant_message}")
             
@@ -2643,12 +3154,17 @@ def audit_news_image_fixed(image_url, api_key):
             return result, tags
             
         except requests.exceptions.RequestException as req_err:
+            # 4xx（429除外）属于请求本身的问题，重试不会有不同结果，直接失败
+            status = getattr(req_err.response, 'status_code', None)
+            if status is not None and 400 <= status < 500 and status != 429:
+                logger.error(f"请求被拒绝({status})，不再重试: {str(req_err)}")
+                return '处理失败', ['图片审核失败']
             retry_count += 1
             logger.error(f"网络请求异常 (尝试 {retry_count}/{max_retries}): {str(req_err)}")
             
             if retry_count >= max_retries:
                 return '处理失败', ['图片审核失败']
-            time.sleep(2)
+            time.sleep(_backoff(retry_count))
             
         except Exception as e:
             retry_count += 1
@@ -2656,7 +3172,7 @@ def audit_news_image_fixed(image_url, api_key):
             
             if retry_count >= max_retries:
                 return '处理失败', ['图片审核失败']
-            time.sleep(2)
+            time.sleep(_backoff(retry_count))
     
     return '处理失败', ['图片审核失败']
 
@@ -2679,28 +3195,34 @@ def audit_news_text_fixed(text_content, api_key):
                 "user": "news_text_auditor"
             }
             
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {api_key}"
-            }
+            headers = _auth_headers(api_key)
             
             logger.info(f"发送文本审核请求，文本长度: {len(text_content)}")
-            response = requests.post(
-                API_URL,
-                headers=headers,
-                json=data,
-                timeout=api_timeout
-            )
+            with _api_semaphore:
+                response = API_SESSION.post(
+                    API_URL,
+                    headers=headers,
+                    json=data,
+                    timeout=api_timeout
+                )
             
             if response.status_code != 200:
                 logger.error(f"文本审核响应错误: {response.status_code} - {response.text}")
                 if response.status_code == 501 and "conversation_id" in response.text:
                     retry_count += 1
-                    time.sleep(2)
+                    time.sleep(_backoff(retry_count))
+                    continue
+                if response.status_code == 429:
+                    # 被限流时按服务端Retry-After等待，没有则退避重试
+                    retry_count += 1
+                    retry_after = response.headers.get('Retry-After')
+                    delay = float(retry_after) if retry_after else _backoff(retry_count)
+                    logger.warning(f"触发限流(429)，{delay:.1f}秒后重试 ({retry_count}/{max_retries})")
+                    time.sleep(delay)
                     continue
                 response.raise_for_status()
             
-            result_data = response.json()
+            result_data = _json_loads(response.content)
             assistant_message = result_data.get('answer', '')
             
             # 使用统一的审核结果解析
@@ -2709,12 +3231,17 @@ def audit_news_text_fixed(text_content, api_key):
             return result, tags
             
         except requests.exceptions.RequestException as req_err:
+            # 4xx（429除外）属于请求本身的问题，重试不会有不同结果，直接失败
+            status = getattr(req_err.response, 'status_code', None)
+            if status is not None and 400 <= status < 500 and status != 429:
+                logger.error(f"请求被拒绝({status})，不再重试: {str(req_err)}")
+                return '处理失败', ['文本审核失败']
             retry_count += 1
             logger.error(f"网络请求异常 (尝试 {retry_count}/{max_retries}): {str(req_err)}")
             
             if retry_count >= max_retries:
                 return '处理失败', ['文本审核失败']
-            time.sleep(2)
+            time.sleep(_backoff(retry_count))
             
         except Exception as e:
             retry_count += 1
@@ -2722,7 +3249,7 @@ def audit_news_text_fixed(text_content, api_key):
             
             if retry_count >= max_retries:
                 return '处理失败', ['文本审核失败']
-            time.sleep(2)
+            time.sleep(_backoff(retry_count))
     
     return '处理失败', ['文本审核失败']
 
@@ -2777,27 +3304,25 @@ def format_image_results(image_results, skipped_count=0):
     
     return "; ".join(details)
 
-def handle_processing_error(df, index, session_id, error_msg):
+def handle_processing_error(results_buffer, index, session_id, error_msg):
     """处理处理过程中的错误"""
     update_task_status('news', session_id, 
                      message=f'资讯 #{index+1} 处理异常: {error_msg}，继续处理下一项', 
                      status='warning')
     
-    # 更新结果为处理失败
-    df.at[index, '审核结果'] = '处理失败'
-    df.at[index, '违规标签'] = '/'
-    df.at[index, '提取图片数量'] = 0
-    df.at[index, '跳过小图片数量'] = 0
-    df.at[index, '图片审核详情'] = '处理失败'
-    df.at[index, '文本审核结果'] = '处理失败'
-    df.at[index, '文本违规标签'] = '/'
-    df.at[index, '审核时间'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    # 记录结果为处理失败，随本批统一写回
+    results_buffer[index] = {
+        '审核结果': '处理失败',
+        '违规标签': '/',
+        '提取图片数量': 0,
+        '跳过小图片数量': 0,
+        '图片审核详情': '处理失败',
+        '文本审核结果': '处理失败',
+        '文本违规标签': '/',
+        '审核时间': _now_str(),
+    }
     # 更新统计
     update_statistics('news', session_id, '处理失败', [])
-    
-    # 保存当前结果
-    result_path = get_result_path('news', session_id)
-    df.to_excel(result_path, index=False)
 
 
 if __name__ == '__main__':